@@ -70,13 +70,14 @@ class TestFollow:
             '`on_delete=models.CASCADE`.'
         )
 
-    def check_url(self, client, url, str_url):
+    def check_url(self, client, url, str_url, method='get'):
+        request = getattr(client, method)
         try:
-            response = client.get(f'{url}')
+            response = request(f'{url}')
         except Exception as e:
             assert False, f'''Страница `{str_url}` работает неправильно. Ошибка: `{e}`'''
         if response.status_code in (301, 302) and response.url == f'{url}/':
-            response = client.get(f'{url}/')
+            response = request(f'{url}/')
         assert response.status_code != 404, f'Страница `{str_url}` не найдена, проверьте этот адрес в *urls.py*'
         return response
 
@@ -88,14 +89,14 @@ class TestFollow:
                 'Проверьте, что не авторизованного пользователя `/follow/` отправляет на страницу авторизации'
             )
 
-        response = self.check_url(client, f'/profile/{user.username}/follow', '/profile/<username>/follow/')
+        response = self.check_url(client, f'/profile/{user.username}/follow/', '/profile/<username>/follow/', method='post')
         if not(response.status_code in (301, 302) and response.url.startswith('/auth/login')):
             assert False, (
                 'Проверьте, что не авторизованного пользователя `profile/<username>/follow/` '
                 'отправляете на страницу авторизации'
             )
 
-        response = self.check_url(client, f'/profile/{user.username}/unfollow', '/profile/<username>/unfollow/')
+        response = self.check_url(client, f'/profile/{user.username}/unfollow/', '/profile/<username>/unfollow/', method='post')
         if not(response.status_code in (301, 302) and response.url.startswith('/auth/login')):
             assert False, (
                 'Проверьте, что не авторизованного пользователя `profile/<username>/unfollow/` '
@@ -109,15 +110,15 @@ class TestFollow:
             '`related_name="follower"'
         )
         assert user.follower.count() == 0, 'Проверьте, что правильно считается подписки'
-        self.check_url(user_client, f'/profile/{post.author.username}/follow', '/profile/<username>/follow/')
+        self.check_url(user_client, f'/profile/{post.author.username}/follow/', '/profile/<username>/follow/', method='post')
         assert user.follower.count() == 0, 'Проверьте, что нельзя подписаться на самого себя'
 
         user_1 = get_user_model().objects.create_user(username='TestUser_2344')
         user_2 = get_user_model().objects.create_user(username='TestUser_73485')
 
-        self.check_url(user_client, f'/profile/{user_1.username}/follow', '/profile/<username>/follow/')
+        self.check_url(user_client, f'/profile/{user_1.username}/follow/', '/profile/<username>/follow/', method='post')
         assert user.follower.count() == 1, 'Проверьте, что вы можете подписаться на пользователя'
-        self.check_url(user_client, f'/profile/{user_1.username}/follow', '/profile/<username>/follow/')
+        self.check_url(user_client, f'/profile/{user_1.username}/follow/', '/profile/<username>/follow/', method='post')
         assert user.follower.count() == 1, 'Проверьте, что вы можете подписаться на пользователя только один раз'
 
         image = tempfile.NamedTemporaryFile(suffix=".jpg").name
@@ -139,21 +140,21 @@ class TestFollow:
             'Проверьте, что на странице `/follow/` список статей авторов на которых подписаны'
         )
 
-        self.check_url(user_client, f'/profile/{user_2.username}/follow', '/profile/<username>/follow/')
+        self.check_url(user_client, f'/profile/{user_2.username}/follow/', '/profile/<username>/follow/', method='post')
         assert user.follower.count() == 2, 'Проверьте, что вы можете подписаться на пользователя'
         response = self.check_url(user_client, '/follow', '/follow/')
         assert len(response.context['page_obj']) == 5, (
             'Проверьте, что на странице `/follow/` список статей авторов на которых подписаны'
         )
 
-        self.check_url(user_client, f'/profile/{user_1.username}/unfollow', '/profile/<username>/unfollow/')
+        self.check_url(user_client, f'/profile/{user_1.username}/unfollow/', '/profile/<username>/unfollow/', method='post')
         assert user.follower.count() == 1, 'Проверьте, что вы можете отписаться от пользователя'
         response = self.check_url(user_client, '/follow', '/follow/')
         assert len(response.context['page_obj']) == 3, (
             'Проверьте, что на странице `/follow/` список статей авторов на которых подписаны'
         )
 
-        self.check_url(user_client, f'/profile/{user_2.username}/unfollow', '/profile/<username>/unfollow/')
+        self.check_url(user_client, f'/profile/{user_2.username}/unfollow/', '/profile/<username>/unfollow/', method='post')
         assert user.follower.count() == 0, 'Проверьте, что вы можете отписаться от пользователя'
         response = self.check_url(user_client, '/follow', '/follow/')
         assert len(response.context['page_obj']) == 0, (
@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import db  # noqa: F401
+        from .middleware import install_template_profiling
+
+        if settings.TEMPLATE_PROFILING:
+            install_template_profiling()
@@ -0,0 +1,158 @@
+import asyncio
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Сколько готовых кусков ответа ждут отправки клиенту; дальше поток
+# представления ждёт, пока медленный клиент их заберёт.
+RESPONSE_QUEUE_SIZE = 8
+
+
+def scope_to_environ(scope, body):
+    """Собирает WSGI environ из ASGI scope и прочитанного тела запроса."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('127.0.0.1', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': client[0],
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = 'HTTP_' + name
+        if name in environ:
+            value = environ[name] + ',' + value
+        environ[name] = value
+    return environ
+
+
+class WsgiToAsgi:
+    """ASGI-приложение поверх WSGI для Django без встроенного ASGI.
+
+    Тело запроса читается в цикле событий, поэтому медленные клиенты
+    не занимают поток: в пуле выполняется только само представление.
+    Ответ отправляется по кускам по мере того, как WSGI-приложение их
+    отдаёт, поэтому StreamingHttpResponse остаётся потоковым.
+    """
+
+    def __init__(self, wsgi_application, max_workers=None):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f'Unsupported scope type: {scope["type"]}')
+
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        await self.respond(scope_to_environ(scope, body), send)
+
+    async def read_body(self, receive):
+        """Тело запроса или None, если клиент отключился."""
+        body = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            body.append(message.get('body', b''))
+            more_body = message.get('more_body', False)
+        return b''.join(body)
+
+    async def respond(self, environ, send):
+        loop = asyncio.get_event_loop()
+        queue = asyncio.Queue(maxsize=RESPONSE_QUEUE_SIZE)
+        cancelled = threading.Event()
+
+        def put(message):
+            if cancelled.is_set():
+                if message is None:
+                    return
+                raise ConnectionAbortedError('Client went away')
+            asyncio.run_coroutine_threadsafe(queue.put(message), loop).result()
+
+        # Весь ответ, включая итерацию по нему, выполняется в одном
+        # потоке: подключения к БД в Django привязаны к потоку.
+        future = loop.run_in_executor(
+            self.executor, self.run_wsgi, environ, put
+        )
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                await send(message)
+        except BaseException:
+            cancelled.set()
+            while not queue.empty():
+                queue.get_nowait()
+            raise
+        await future
+
+    def run_wsgi(self, environ, put):
+        """Выполняет WSGI-приложение, передавая ASGI-сообщения в put."""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        def start():
+            if not response.get('started'):
+                response['started'] = True
+                put({
+                    'type': 'http.response.start',
+                    'status': response['status'],
+                    'headers': response['headers'],
+                })
+
+        try:
+            result = self.wsgi_application(environ, start_response)
+            try:
+                for chunk in result:
+                    start()
+                    if chunk:
+                        put({
+                            'type': 'http.response.body',
+                            'body': chunk,
+                            'more_body': True,
+                        })
+                start()
+                put({'type': 'http.response.body', 'body': b''})
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        finally:
+            # Конец ответа, в том числе после ошибки представления.
+            put(None)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
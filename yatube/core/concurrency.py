@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .routers import reading_from_replica, replica_flag
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.VIEW_FANOUT_WORKERS,
+            thread_name_prefix='fanout',
+        )
+    return _executor
+
+
+def _run(call, flag):
+    close_old_connections()
+    try:
+        with reading_from_replica(flag):
+            return call()
+    finally:
+        close_old_connections()
+
+
+def gather(*calls):
+    """Выполняет независимые запросы к БД параллельно.
+
+    Внутри транзакции все запросы обязаны идти через одно подключение,
+    поэтому там вызовы выполняются по очереди.
+    """
+    if not settings.VIEW_FANOUT_WORKERS or connection.in_atomic_block:
+        return [call() for call in calls]
+    flag = replica_flag()
+    futures = [_get_executor().submit(_run, call, flag) for call in calls]
+    return [future.result() for future in futures]
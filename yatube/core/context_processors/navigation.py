@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+from django.urls import get_script_prefix, get_urlconf, reverse
+
+NAVIGATION = {
+    'index': 'posts:index',
+    'popular': 'posts:popular',
+    'follow_index': 'posts:follow_index',
+    'groups': 'posts:groups',
+    'post_create': 'posts:post_create',
+    'about_author': 'about:author',
+    'about_tech': 'about:tech',
+    'login': 'users:login',
+    'logout': 'users:logout',
+    'signup': 'users:signup',
+    'password_change': 'users:password_change',
+    'notifications': 'notifications:index',
+}
+
+
+@lru_cache(maxsize=None)
+def navigation_urls(script_prefix, urlconf):
+    """Адреса меню; зависят только от префикса и URLconf."""
+    return {key: reverse(view_name) for key, view_name in NAVIGATION.items()}
+
+
+@lru_cache(maxsize=4096)
+def profile_url(username, script_prefix, urlconf):
+    return reverse('posts:profile', args=(username,))
+
+
+def navigation(request):
+    """Добавляет пункты меню с адресами и признаком текущей страницы."""
+    script_prefix, urlconf = get_script_prefix(), get_urlconf()
+    urls = navigation_urls(script_prefix, urlconf)
+    view_name = getattr(request.resolver_match, 'view_name', None)
+
+    nav = {
+        key: {'url': urls[key], 'active': NAVIGATION[key] == view_name}
+        for key in NAVIGATION
+    }
+    if request.user.is_authenticated:
+        nav['profile'] = {
+            'url': profile_url(
+                request.user.username, script_prefix, urlconf
+            ),
+            'active': view_name == 'posts:profile',
+        }
+    return {'nav': nav}
@@ -1,8 +1,24 @@
+import time
+
 from django.utils import timezone
 
+_year = None
+_expires = 0
+
 
 def year(request):
-    """Добавляет переменную с текущим годом."""
+    """Добавляет переменную с текущим годом.
+
+    Год пересчитывается только после наступления следующего.
+    """
+    global _year, _expires
+    if time.time() >= _expires:
+        now = timezone.now()
+        _year = now.year
+        _expires = now.replace(
+            year=now.year + 1, month=1, day=1,
+            hour=0, minute=0, second=0, microsecond=0
+        ).timestamp()
     return {
-        'year': timezone.now().year
+        'year': _year
     }
@@ -0,0 +1,22 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connection, connections
+
+
+@contextmanager
+def scratch_database():
+    """Временная БД со схемой проекта, чтобы замеры не трогали данные."""
+    if connection.vendor == 'sqlite':
+        fd, path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        connection.settings_dict['TEST']['NAME'] = path
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True
+    )
+    try:
+        yield
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
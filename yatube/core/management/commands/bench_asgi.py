@@ -0,0 +1,109 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from posts.models import Comment, Group, Post
+
+from ...asgi import WsgiToAsgi, scope_to_environ
+from ..bench import scratch_database
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает WSGI-воркеры и ASGI-приложение при множестве медленных '
+        'клиентов. Клиент передаёт запрос за --delay секунд.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--delay', type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            author = User.objects.create_user(username='bench_asgi')
+            group = Group.objects.create(
+                title='bench', slug='bench', description='bench'
+            )
+            post = Post.objects.create(
+                text='bench', author=author, group=group
+            )
+            Comment.objects.bulk_create(
+                Comment(text=f'bench {i}', post=post, author=author)
+                for i in range(20)
+            )
+            connections.close_all()
+
+            path = f'/posts/{post.pk}/'
+            application = get_wsgi_application()
+            results = {
+                'wsgi (thread per client)': self.run_wsgi(
+                    application, path, options
+                ),
+                'asgi (event loop + pool)': self.run_asgi(
+                    WsgiToAsgi(application, max_workers=options['workers']),
+                    path,
+                    options,
+                ),
+            }
+
+        self.stdout.write(
+            f'GET {path}: {options["clients"]} clients, '
+            f'{options["workers"]} workers, {options["delay"]}s per upload'
+        )
+        for name, elapsed in results.items():
+            self.stdout.write(
+                f'{name:<26} {elapsed:>7.2f} s  '
+                f'{options["clients"] / elapsed:>8.1f} req/s'
+            )
+
+    @staticmethod
+    def scope(path):
+        return {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80),
+        }
+
+    def run_wsgi(self, application, path, options):
+        def client(_):
+            # Синхронный воркер занят, пока клиент передаёт запрос.
+            time.sleep(options['delay'])
+            environ = scope_to_environ(self.scope(path), b'')
+            result = application(environ, lambda status, headers: None)
+            b''.join(result)
+            result.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            list(pool.map(client, range(options['clients'])))
+        return time.perf_counter() - started
+
+    def run_asgi(self, application, path, options):
+        async def receive():
+            await asyncio.sleep(options['delay'])
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            pass
+
+        async def clients():
+            await asyncio.gather(*(
+                application(self.scope(path), receive, send)
+                for _ in range(options['clients'])
+            ))
+
+        started = time.perf_counter()
+        asyncio.run(clients())
+        elapsed = time.perf_counter() - started
+        application.executor.shutdown()
+        return elapsed
@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+from django.test.utils import override_settings
+from posts.models import Comment, Post
+
+from ..bench import scratch_database
+
+User = get_user_model()
+
+MODES = (
+    ('new connection per request', 0, False),
+    ('persistent connections', 600, False),
+    ('persistent + tuned sqlite', 600, True),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность БД при подключении на каждый '
+        'запрос, постоянных подключениях и настроенном SQLite. '
+        'Работает на временной копии схемы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--write-ratio', type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        is_sqlite = connection.vendor == 'sqlite'
+        self.stdout.write(
+            f'{connection.vendor}, pool={settings.DB_POOL or "-"}, '
+            f'{options["threads"]} threads x {options["requests"]} requests'
+        )
+        for name, conn_max_age, tuned in MODES:
+            if tuned and not is_sqlite:
+                continue
+            pragmas = settings.SQLITE_PRAGMAS if tuned or not is_sqlite else {}
+            with override_settings(SQLITE_PRAGMAS=pragmas):
+                result = self.run_mode(conn_max_age, options)
+            self.stdout.write(
+                f'{name:<30} {result["rps"]:>8.1f} req/s  '
+                f'p95 {result["p95"]:>7.1f} ms  errors {result["errors"]}'
+            )
+
+    def run_mode(self, conn_max_age, options):
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+        with scratch_database():
+            author = User.objects.create_user(username='bench_db')
+            post = Post.objects.create(text='bench', author=author)
+            connections.close_all()
+            return self.run_workers(author.pk, post.pk, options)
+
+    def run_workers(self, author_id, post_id, options):
+        latencies = []
+        errors = []
+
+        def worker():
+            for _ in range(options['requests']):
+                close_old_connections()
+                started = time.perf_counter()
+                try:
+                    if random.random() < options['write_ratio']:
+                        Comment.objects.create(
+                            text='bench', post_id=post_id, author_id=author_id
+                        )
+                    else:
+                        list(Post.objects.select_related('author')[:10])
+                        Comment.objects.filter(post_id=post_id).count()
+                except Exception:
+                    errors.append(1)
+                latencies.append(time.perf_counter() - started)
+                close_old_connections()
+            connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker)
+            for _ in range(options['threads'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'rps': len(latencies) / elapsed,
+            'p95': latencies[int(len(latencies) * 0.95)] * 1000,
+            'errors': len(errors),
+        }
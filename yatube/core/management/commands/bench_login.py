@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from users.forms import ThrottledAuthenticationForm
+
+from ..bench import scratch_database
+
+User = get_user_model()
+
+PBKDF2_HASHER = 'users.hashers.PBKDF2PasswordHasher'
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет число входов в секунду для доступных хешеров паролей и '
+        'для отклонённых ограничителем попыток.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20)
+        parser.add_argument(
+            '--iterations', type=int, nargs='*', default=[150000, 30000],
+            help='Числа итераций PBKDF2 для сравнения.'
+        )
+
+    def handle(self, *args, **options):
+        modes = [
+            (f'pbkdf2 x{iterations}', [PBKDF2_HASHER], iterations)
+            for iterations in options['iterations']
+        ]
+        modes += [
+            (hasher.rsplit('.', 1)[-1], [hasher], settings.PBKDF2_ITERATIONS)
+            for hasher in settings.PASSWORD_HASHERS
+            if 'PBKDF2' not in hasher
+        ]
+        with scratch_database():
+            for name, hashers, iterations in modes:
+                with override_settings(
+                    PASSWORD_HASHERS=hashers, PBKDF2_ITERATIONS=iterations
+                ):
+                    rate = self.measure(options['logins'])
+                self.stdout.write(f'{name:<32} {rate:>8.1f} logins/s')
+            self.stdout.write(
+                f'{"rejected by throttle":<32} '
+                f'{self.measure_throttled(options["logins"]):>8.1f} attempts/s'
+            )
+
+    @staticmethod
+    def measure(logins):
+        User.objects.filter(username='bench_login').delete()
+        User.objects.create_user(username='bench_login', password='pass')
+        started = time.perf_counter()
+        for _ in range(logins):
+            assert authenticate(username='bench_login', password='pass')
+        return logins / (time.perf_counter() - started)
+
+    @staticmethod
+    def measure_throttled(logins):
+        request = RequestFactory().post('/auth/login/')
+        data = {'username': 'bench_login', 'password': 'wrong'}
+        with override_settings(LOGIN_ATTEMPTS_PER_USERNAME=0):
+            started = time.perf_counter()
+            for _ in range(logins):
+                assert not ThrottledAuthenticationForm(
+                    request, data=data
+                ).is_valid()
+            return logins / (time.perf_counter() - started)
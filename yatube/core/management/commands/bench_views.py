@@ -0,0 +1,93 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from posts.models import Comment, Group, Post
+
+from ...context_processors import navigation, year
+from ..bench import scratch_database
+
+User = get_user_model()
+
+PATHS = (
+    '/',
+    '/popular/',
+    '/group/bench/',
+    '/profile/bench_views/',
+    '/posts/{post_id}/',
+    '/follow/',
+    '/create/',
+    '/about/author/',
+    '/about/tech/',
+    '/auth/login/',
+    '/auth/signup/',
+)
+
+
+def forget_navigation():
+    """Сбрасывает кеши меню и года: так работал рендер без них."""
+    navigation.navigation_urls.cache_clear()
+    navigation.profile_url.cache_clear()
+    year._expires = 0
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет процессорное время рендера страниц с кешем адресов меню '
+        'и года и без него. Страничный кеш сбрасывается перед каждым '
+        'запросом.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with scratch_database(), override_settings(
+            ALLOWED_HOSTS=['testserver'], VIEW_FANOUT_WORKERS=0
+        ):
+            author = User.objects.create_user(username='bench_views')
+            group = Group.objects.create(
+                title='bench', slug='bench', description='bench'
+            )
+            Post.objects.bulk_create(
+                Post(
+                    text=f'bench {i}',
+                    preview=f'bench {i}',
+                    author=author,
+                    group=group
+                )
+                for i in range(30)
+            )
+            post = Post.objects.latest('pk')
+            Comment.objects.bulk_create(
+                Comment(text='bench', post=post, author=author)
+                for _ in range(10)
+            )
+            client = Client()
+            client.force_login(author)
+
+            self.stdout.write(
+                f'{"path":<24} {"uncached":>12} {"cached":>12}  ms CPU/req'
+            )
+            for path in PATHS:
+                path = path.format(post_id=post.pk)
+                cold, warm = self.measure(client, path, options['requests'])
+                self.stdout.write(f'{path:<24} {cold:>12.3f} {warm:>12.3f}')
+
+    @staticmethod
+    def measure(client, path, requests):
+        """Чередует запросы без кеша меню и с ним, чтобы шум был общим."""
+        spent = [0, 0]
+        for number in range(requests * 2):
+            cached = number % 2
+            cache.clear()
+            if not cached:
+                forget_navigation()
+            started = time.process_time()
+            response = client.get(path)
+            spent[cached] += time.process_time() - started
+            assert response.status_code == 200, (path, response.status_code)
+        return [total / requests * 1000 for total in spent]
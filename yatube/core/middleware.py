@@ -0,0 +1,244 @@
+import gzip
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse
+from django.template.base import Template
+from django.utils.cache import get_max_age, patch_vary_headers
+from django.utils.text import compress_sequence
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MIN_COMPRESS_SIZE = 200
+CSRF_FIELD = b'csrfmiddlewaretoken'
+COMPRESSIBLE_TYPES = frozenset((
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+))
+
+
+def _qualities(accept_encoding):
+    """Словарь кодировка -> q из заголовка Accept-Encoding."""
+    qualities = {}
+    for item in accept_encoding.split(','):
+        name, *params = item.split(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def accepts_encoding(request, encoding):
+    """Принимает ли клиент encoding: q=0 запрещает кодировку явно,
+    а '*' разрешает или запрещает все не названные.
+    """
+    qualities = _qualities(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    return qualities.get(encoding, qualities.get('*', 0)) > 0
+
+
+def _compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=5)
+    return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+def _carries_csrf_token(request, response):
+    """Есть ли в ответе CSRF-токен.
+
+    csrf_token в шаблоне помечает запрос CSRF_COOKIE_USED; страницы из
+    кеша шаблон не рендерят, поэтому тело проверяется ещё и напрямую.
+    """
+    if request.META.get('CSRF_COOKIE_USED'):
+        return True
+    return (
+        not response.streaming and CSRF_FIELD in response.content
+    )
+
+
+def _is_compressible(response):
+    """Текст стоит сжимать; картинки и архивы уже сжаты.
+
+    FileResponse не трогаем: статика приходит из core.static.serve со
+    своим готовым сжатием и Content-Length.
+    """
+    if isinstance(response, FileResponse):
+        return False
+    content_type = response.get('Content-Type', '').split(';')[0].strip()
+    return (
+        content_type.startswith('text/')
+        or content_type in COMPRESSIBLE_TYPES
+        or content_type.endswith(('+json', '+xml'))
+    )
+
+
+def _is_cacheable(response):
+    cache_control = response.get('Cache-Control', '')
+    if 'private' in cache_control or 'no-store' in cache_control:
+        return False
+    return (get_max_age(response) or 0) > 0
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip или brotli в зависимости от Accept-Encoding.
+
+    Страницы с CSRF-токеном не сжимаются (защита от BREACH): Django
+    маскирует сам токен, но не остальные секреты той же страницы.
+
+    Сжатое тело кешируемых ответов (положительный max-age без private
+    и no-store, как у cache_page) хранится в кеше по хешу исходного,
+    поэтому повторная отдача той же страницы не сжимает её заново.
+    Хеш и обращение к кешу делаются только для таких ответов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header('Content-Encoding'):
+            return response
+        if not _is_compressible(response):
+            return response
+        if _carries_csrf_token(request, response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if response.streaming:
+            if accepts_encoding(request, 'gzip'):
+                response.streaming_content = compress_sequence(
+                    response.streaming_content
+                )
+                del response['Content-Length']
+                self.set_encoding(response, 'gzip')
+            return response
+
+        if len(response.content) < MIN_COMPRESS_SIZE:
+            return response
+        if brotli is not None and accepts_encoding(request, 'br'):
+            encoding = 'br'
+        elif accepts_encoding(request, 'gzip'):
+            encoding = 'gzip'
+        else:
+            return response
+
+        compressed = self.compressed_content(response, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        self.set_encoding(response, encoding)
+        return response
+
+    @staticmethod
+    def compressed_content(response, encoding):
+        if not _is_cacheable(response):
+            return _compress(response.content, encoding)
+        digest = hashlib.md5(response.content).hexdigest()
+        key = f'compressed:{encoding}:{digest}'
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = _compress(response.content, encoding)
+            cache.set(key, compressed, settings.CACHE_SAVE_TIME)
+        return compressed
+
+    @staticmethod
+    def set_encoding(response, encoding):
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+        response['Content-Encoding'] = encoding
+
+
+_profile = threading.local()
+
+
+def _profiled(render):
+    def _render(self, context):
+        stats = getattr(_profile, 'stats', None)
+        if stats is None:
+            return render(self, context)
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            entry = stats.setdefault(self.origin.template_name or '-', [0, 0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - started
+
+    _render.original = render
+    return _render
+
+
+def install_template_profiling():
+    """Оборачивает Template._render замером времени.
+
+    Вызывается один раз из CoreConfig.ready при TEMPLATE_PROFILING;
+    без него шаблоны рендерятся без обёртки.
+    """
+    if not hasattr(Template._render, 'original'):
+        Template._render = _profiled(Template._render)
+
+
+def uninstall_template_profiling():
+    Template._render = getattr(
+        Template._render, 'original', Template._render
+    )
+
+
+class TemplateProfilingMiddleware:
+    """Замеряет время рендера каждого шаблона и include за запрос.
+
+    Время включает вложенные шаблоны. Итог уходит в заголовок
+    Server-Timing и в лог core.middleware. Включается TEMPLATE_PROFILING.
+    Потоковые ответы рендерятся уже после заголовков, поэтому в замер
+    попадает только то, что отрендерено до отдачи ответа.
+    """
+
+    def __init__(self, get_response):
+        if not hasattr(Template._render, 'original'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _profile.stats = {}
+        try:
+            response = self.get_response(request)
+        finally:
+            stats = _profile.stats
+            del _profile.stats
+
+        timings = sorted(
+            stats.items(), key=lambda item: item[1][1], reverse=True
+        )
+        for name, (calls, elapsed) in timings:
+            logger.debug(
+                '%s %s: %.2f ms x%d', request.path, name, elapsed * 1000, calls
+            )
+        if timings:
+            response['Server-Timing'] = ', '.join(
+                f'tpl{index};desc="{name} x{calls}";dur={elapsed * 1000:.2f}'
+                for index, (name, (calls, elapsed)) in enumerate(timings)
+            )
+        return response
@@ -0,0 +1,97 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import time
+
+from django.conf import settings
+
+PIN_SESSION_KEY = '_replica_pin'
+
+_state = threading.local()
+
+
+def replica_flag():
+    return getattr(_state, 'use_replica', False)
+
+
+def use_replica():
+    return bool(settings.REPLICA_DATABASE) and replica_flag()
+
+
+@contextmanager
+def reading_from_replica(flag):
+    _state.use_replica = flag
+    try:
+        yield
+    finally:
+        _state.use_replica = False
+
+
+class ReplicaRouter:
+    """Отправляет чтения из представлений с replica_reads на реплику."""
+
+    def db_for_read(self, model, **hints):
+        if use_replica():
+            return settings.REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.REPLICA_DATABASE:
+            return False
+        return None
+
+
+def _pinned_for(request):
+    """Сколько секунд ещё действует отметка; без сессии - 0."""
+    session = getattr(request, 'session', None)
+    if session is None:
+        return 0
+    return session.get(PIN_SESSION_KEY, 0) - time()
+
+
+def _wrote(request, response):
+    """Похоже ли, что запрос что-то изменил.
+
+    Успешная форма отвечает редиректом, AJAX - фрагментом с кодом 200;
+    форма с ошибками показывается снова с кодом 200 и ничего не пишет.
+    """
+    if request.method in ('GET', 'HEAD', 'OPTIONS'):
+        return False
+    status = response.status_code
+    return 300 <= status < 400 or request.is_ajax() and status < 300
+
+
+def replica_reads(view):
+    """Читает из реплики, если пользователь недавно ничего не менял."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with reading_from_replica(_pinned_for(request) <= 0):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+def pin_to_primary(view):
+    """После изменений представлением читает данные из default.
+
+    Отметка хранится в сессии до истечения REPLICA_STICKY_TIME: сессии
+    общие для всех процессов, в отличие от локального кеша. Пока от
+    отметки осталось больше половины, сессия не перезаписывается.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        sticky_time = settings.REPLICA_STICKY_TIME
+        if (
+            hasattr(request, 'session')
+            and _wrote(request, response)
+            and _pinned_for(request) < sticky_time / 2
+        ):
+            request.session[PIN_SESSION_KEY] = time() + sticky_time
+        return response
+    return wrapper
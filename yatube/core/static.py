@@ -0,0 +1,46 @@
+import mimetypes
+import os
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .middleware import accepts_encoding
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MUTABLE_MAX_AGE = 60
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def serve(request, path):
+    """Отдаёт собранную статику: готовое сжатие и вечный кеш по хешу."""
+    path = os.path.normpath(path).lstrip('/')
+    if path.startswith('..') or not staticfiles_storage.exists(path):
+        raise Http404(path)
+
+    full_path = staticfiles_storage.path(path)
+    encoding = None
+    for name, extension in ENCODINGS:
+        if (
+            accepts_encoding(request, name)
+            and os.path.exists(full_path + extension)
+        ):
+            full_path += extension
+            encoding = name
+            break
+
+    content_type, _ = mimetypes.guess_type(path)
+    response = FileResponse(
+        open(full_path, 'rb'),
+        content_type=content_type or 'application/octet-stream'
+    )
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if path in getattr(staticfiles_storage, 'immutable_names', ()):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+    return response
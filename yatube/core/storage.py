@@ -0,0 +1,71 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.functional import cached_property
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.ico', '.json', '.map', '.txt', '.xml'
+)
+MIN_COMPRESS_SIZE = 256
+
+
+def compressed_variants(content):
+    """Сжатые копии файла: расширение -> байты; только если они меньше."""
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    return {
+        extension: data
+        for extension, data in variants.items()
+        if len(data) < len(content)
+    }
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хеширует имена файлов и кладёт рядом .gz и .br копии.
+
+    Файлы без записи в манифесте отдаются по исходному имени, чтобы
+    шаблоны рендерились и до первого collectstatic.
+    """
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+
+        self.__dict__.pop('immutable_names', None)
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for extension, data in compressed_variants(content).items():
+            with open(self.path(name) + extension, 'wb') as compressed:
+                compressed.write(data)
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    @cached_property
+    def immutable_names(self):
+        """Имена с хешем содержимого: по ним файл не изменится никогда."""
+        return set(self.hashed_files.values())
@@ -0,0 +1,39 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+
+
+def stream_template(request, template_name, context, marker, parts):
+    """Отдаёт страницу потоком: сначала шаблон до marker, затем parts.
+
+    Шаблон без списка рендерится целиком до первого байта, поэтому
+    выигрыш даёт только ленивый parts: длинный список читается из БД и
+    рендерится по частям уже после отправки шапки, не собираясь в
+    памяти в одну строку.
+    """
+    head, tail = render_to_string(
+        template_name, context, request
+    ).split(marker, 1)
+
+    def content():
+        yield head
+        yield from parts
+        yield tail
+
+    return StreamingHttpResponse(content())
+
+
+def render_batches(template_name, name, items, batch_size=50):
+    """Рендерит items порциями по batch_size через template_name.
+
+    items читается по мере отправки, так что сюда можно передать
+    queryset.iterator().
+    """
+    template = get_template(template_name)
+    items = iter(items)
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            return
+        yield template.render({name: batch})
@@ -0,0 +1,10 @@
+from django.core.mail import EmailMultiAlternatives
+from tasks.queue import task
+
+
+@task
+def send_email(subject, body, from_email, to, html_body=None):
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html_body is not None:
+        message.attach_alternative(html_body, 'text/html')
+    message.send()
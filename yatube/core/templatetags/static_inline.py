@@ -0,0 +1,31 @@
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+def _read(path):
+    stored_name = staticfiles_storage.stored_name(path)
+    if staticfiles_storage.exists(stored_name):
+        with staticfiles_storage.open(stored_name) as static_file:
+            return static_file.read().decode()
+    found = finders.find(path)
+    if found is None:
+        return ''
+    with open(found, encoding='utf-8') as static_file:
+        return static_file.read()
+
+
+_read_cached = lru_cache(maxsize=None)(_read)
+
+
+@register.simple_tag
+def inline_static(path):
+    """Встраивает статический файл в страницу, например критический CSS."""
+    content = _read(path) if settings.DEBUG else _read_cached(path)
+    return mark_safe(content)
@@ -1,4 +1,38 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, router
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+from django.template import engines
+from django.template.base import Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from posts.models import Post
+
+from .asgi import WsgiToAsgi
+from .concurrency import gather
+from .middleware import (CompressionMiddleware, accepts_encoding,
+                         install_template_profiling,
+                         uninstall_template_profiling)
+from .routers import pin_to_primary, replica_reads
+from .static import serve as serve_static
+from .warmup import warm_templates
+
+User = get_user_model()
 
 
 class TestTemplate(TestCase):
@@ -6,3 +40,348 @@ class TestTemplate(TestCase):
     def test_404_use_correct_template(self):
         response = self.client.get('/error/')
         self.assertTemplateUsed(response, 'core/404.html')
+
+
+class TestSQLiteTuning(TestCase):
+
+    def test_pragmas_applied(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        pragmas = {
+            'synchronous': 1,
+            'busy_timeout': 5000,
+        }
+        with connection.cursor() as cursor:
+            for pragma, expected in pragmas.items():
+                with self.subTest(pragma=pragma):
+                    cursor.execute(f'PRAGMA {pragma}')
+                    self.assertEqual(cursor.fetchone()[0], expected)
+
+
+@override_settings(REPLICA_DATABASE='replica')
+class TestReplicaRouter(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.session = SessionStore()
+
+    def read_db(self, session):
+        request = self.factory.get('/')
+        request.session = session
+        view = replica_reads(
+            lambda request: HttpResponse(router.db_for_read(Post))
+        )
+        return view(request).content.decode()
+
+    def write(self, method, response):
+        request = getattr(self.factory, method)('/')
+        request.session = self.session
+        pin_to_primary(lambda request: response)(request)
+
+    def test_reads_go_to_replica_inside_view_only(self):
+        self.assertEqual(self.read_db(SessionStore()), 'replica')
+        self.assertEqual(router.db_for_read(Post), 'default')
+        self.assertEqual(router.db_for_write(Post), 'default')
+
+    def test_writer_is_pinned_to_primary(self):
+        self.write('post', HttpResponseRedirect('/'))
+        self.session.save()
+
+        self.assertEqual(
+            self.read_db(SessionStore(self.session.session_key)), 'default'
+        )
+        self.assertEqual(self.read_db(SessionStore()), 'replica')
+
+    def test_pin_expires(self):
+        self.write('post', HttpResponseRedirect('/'))
+        with patch('core.routers.time', return_value=time.time() + 60):
+            self.assertEqual(self.read_db(self.session), 'replica')
+
+    def test_fresh_pin_not_rewritten(self):
+        self.write('post', HttpResponseRedirect('/'))
+        self.session.modified = False
+        self.write('post', HttpResponseRedirect('/'))
+
+        self.assertFalse(self.session.modified)
+
+    def test_reads_and_failed_forms_not_pinned(self):
+        self.write('get', HttpResponseRedirect('/'))
+        self.write('post', HttpResponse())
+
+        self.assertEqual(self.read_db(self.session), 'replica')
+
+
+class TestAsgi(TestCase):
+
+    def test_wsgi_application_served_over_asgi(self):
+        application = WsgiToAsgi(get_wsgi_application(), max_workers=1)
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': '/about/author/',
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(application(scope, receive, send))
+        application.executor.shutdown()
+
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertIn(b'href="/about/tech/"', messages[1]['body'])
+
+    def test_streaming_response_sent_in_chunks(self):
+        head_sent = threading.Event()
+        streamed = []
+
+        def wsgi_application(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            yield b'head'
+            # Хвост готов, только когда клиент уже получил начало.
+            streamed.append(head_sent.wait(timeout=2))
+            yield b'tail'
+
+        application = WsgiToAsgi(wsgi_application, max_workers=1)
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+            if message.get('body') == b'head':
+                head_sent.set()
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+        asyncio.run(application(scope, receive, send))
+        application.executor.shutdown()
+
+        self.assertEqual(
+            [message.get('body') for message in messages],
+            [None, b'head', b'tail', b'']
+        )
+        self.assertTrue(messages[1]['more_body'])
+        self.assertFalse(messages[-1].get('more_body', False))
+        self.assertEqual(streamed, [True])
+
+    def test_gather_keeps_order(self):
+        self.assertEqual(
+            gather(lambda: 1, lambda: 2, lambda: 3),
+            [1, 2, 3]
+        )
+
+
+class TestStaticPipeline(TestCase):
+
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.source, 'css'))
+        self.css = ('body { color: black; }\n' * 50).encode()
+        with open(os.path.join(self.source, 'css', 'my_css.css'), 'wb') as f:
+            f.write(self.css)
+
+        static_settings = override_settings(
+            STATICFILES_DIRS=[self.source],
+            STATIC_ROOT=self.root,
+        )
+        static_settings.enable()
+        self.addCleanup(static_settings.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.source, ignore_errors=True)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_hashed_file_precompressed(self):
+        hashed_name = staticfiles_storage.stored_name('css/my_css.css')
+        self.assertNotEqual(hashed_name, 'css/my_css.css')
+        with open(staticfiles_storage.path(hashed_name) + '.gz', 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), self.css)
+
+    def test_hashed_file_served_immutable_and_compressed(self):
+        hashed_name = staticfiles_storage.stored_name('css/my_css.css')
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+        response = serve_static(request, hashed_name)
+        response.close()
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_refused_encoding_not_served(self):
+        hashed_name = staticfiles_storage.stored_name('css/my_css.css')
+        for header, expected in (
+            ('gzip;q=0', None),
+            ('br;q=0, gzip', 'gzip'),
+            ('*;q=0', None),
+        ):
+            with self.subTest(header=header):
+                request = RequestFactory().get(
+                    '/', HTTP_ACCEPT_ENCODING=header
+                )
+                response = serve_static(request, hashed_name)
+                response.close()
+                self.assertEqual(response.get('Content-Encoding'), expected)
+                self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_unhashed_name_not_cached_forever(self):
+        request = RequestFactory().get('/')
+
+        response = serve_static(request, 'css/my_css.css')
+        response.close()
+
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class TestCompression(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Post.objects.create(
+            text='Длинный текст поста ' * 50,
+            author=User.objects.create_user(username='dev')
+        )
+
+    def test_gzip_negotiated(self):
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        plain = self.client.get('/')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+
+    def test_accept_encoding_q_values(self):
+        factory = RequestFactory()
+        for header, encoding, accepted in (
+            ('gzip, deflate', 'gzip', True),
+            ('gzip;q=0', 'gzip', False),
+            ('GZIP; Q=0.5', 'gzip', True),
+            ('identity, *;q=0.1', 'br', True),
+            ('*;q=0, gzip', 'br', False),
+            ('brotli', 'br', False),
+            ('', 'gzip', False),
+        ):
+            with self.subTest(header=header, encoding=encoding):
+                request = factory.get('/', HTTP_ACCEPT_ENCODING=header)
+                self.assertEqual(
+                    accepts_encoding(request, encoding), accepted
+                )
+
+    def test_only_text_compressed(self):
+        factory = RequestFactory()
+        body = b'x' * 1000
+        for response, compressed in (
+            (HttpResponse(body, content_type='image/png'), False),
+            (FileResponse(io.BytesIO(body), content_type='text/css'), False),
+            (HttpResponse(body, content_type='application/json'), True),
+            (HttpResponse(body, content_type='image/svg+xml'), True),
+        ):
+            with self.subTest(content_type=response['Content-Type']):
+                request = factory.get('/', HTTP_ACCEPT_ENCODING='gzip')
+                result = CompressionMiddleware(
+                    lambda request: response
+                )(request)
+                self.assertEqual(
+                    result.has_header('Content-Encoding'), compressed
+                )
+
+    def test_refused_gzip_not_compressed(self):
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_cached_page_not_recompressed(self):
+        self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        with patch('core.middleware._compress') as compress:
+            response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+        compress.assert_not_called()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_page_with_csrf_token_not_compressed(self):
+        self.client.force_login(User.objects.get(username='dev'))
+        response = self.client.get('/create/', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_uncacheable_page_not_hashed(self):
+        post = Post.objects.get()
+        with patch('core.middleware.hashlib.md5') as md5:
+            response = self.client.get(
+                f'/posts/{post.pk}/', HTTP_ACCEPT_ENCODING='gzip'
+            )
+
+        md5.assert_not_called()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+class TestTemplates(TestCase):
+
+    @override_settings(TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': settings.TEMPLATES[0]['DIRS'],
+        'OPTIONS': {
+            'loaders': [(
+                'django.template.loaders.cached.Loader',
+                ['django.template.loaders.filesystem.Loader',
+                 'django.template.loaders.app_directories.Loader'],
+            )],
+            'context_processors': (
+                settings.TEMPLATES[0]['OPTIONS']['context_processors']
+            ),
+        },
+    }])
+    def test_warmup_fills_cached_loader(self):
+        self.assertGreater(warm_templates(), 0)
+        cached = engines['django'].engine.template_loaders[0]
+        self.assertIn('includes/card.html', cached.get_template_cache)
+        self.assertIn('posts/index.html', cached.get_template_cache)
+
+    def test_profiling_off_by_default(self):
+        self.assertFalse(hasattr(Template._render, 'original'))
+        response = self.client.get('/about/tech/')
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_profiling_reports_includes(self):
+        install_template_profiling()
+        self.addCleanup(uninstall_template_profiling)
+        cache.clear()
+        response = self.client.get('/')
+        timing = response['Server-Timing']
+        self.assertIn('desc="posts/index.html x1"', timing)
+        self.assertIn('includes/header.html', timing)
+
+
+class TestNavigation(TestCase):
+
+    def test_menu_urls_and_active_item(self):
+        user = User.objects.create_user(username='dev')
+        self.client.force_login(user)
+
+        response = self.client.get('/about/tech/')
+        nav = response.context['nav']
+
+        self.assertEqual(nav['about_author']['url'], '/about/author/')
+        self.assertTrue(nav['about_tech']['active'])
+        self.assertFalse(nav['about_author']['active'])
+        self.assertEqual(nav['profile']['url'], '/profile/dev/')
+        self.assertContains(response, 'href="/profile/dev/"')
+
+    def test_year_computed_once(self):
+        self.client.get('/about/tech/')
+        with patch('django.utils.timezone.now') as now:
+            response = self.client.get('/about/tech/')
+
+        now.assert_not_called()
+        self.assertEqual(response.context['year'], timezone.now().year)
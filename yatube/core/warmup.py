@@ -0,0 +1,38 @@
+import logging
+import os
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger(__name__)
+
+
+def template_names(engine):
+    """Имена всех шаблонов из каталогов движка и приложений."""
+    dirs = list(engine.dirs) + list(get_app_template_dirs('templates'))
+    names = set()
+    for template_dir in dirs:
+        for root, _, files in os.walk(template_dir):
+            for filename in files:
+                if filename.endswith(('.html', '.txt')):
+                    path = os.path.join(root, filename)
+                    names.add(os.path.relpath(path, template_dir))
+    return sorted(name.replace(os.sep, '/') for name in names)
+
+
+def warm_templates():
+    """Компилирует все шаблоны, чтобы кеширующий загрузчик их запомнил.
+
+    Вызывается при старте процесса: первые запросы не тратят время на
+    чтение и разбор шаблонов с диска. Возвращает число шаблонов.
+    """
+    count = 0
+    for engine in engines.all():
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                logger.warning('Template %s not compiled: %s', name, error)
+            else:
+                count += 1
+    return count
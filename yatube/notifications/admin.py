@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import Notification
+
+
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'recipient', 'kind', 'post', 'actor', 'count', 'is_read',
+        'updated'
+    )
+    list_filter = ('kind', 'is_read')
+    raw_id_fields = ('recipient', 'post', 'actor')
+
+
+admin.site.register(Notification, NotificationAdmin)
@@ -0,0 +1,18 @@
+from django.utils.functional import SimpleLazyObject
+
+from ..delivery import unread_count
+
+
+def unread_notifications(request):
+    """Число непрочитанных уведомлений для значка в меню.
+
+    Считается, только если шаблон к нему обратился, и обычно берётся
+    из кеша без запросов к БД.
+    """
+    if not request.user.is_authenticated:
+        return {}
+    return {
+        'unread_notifications': SimpleLazyObject(
+            lambda: unread_count(request.user.pk)
+        ),
+    }
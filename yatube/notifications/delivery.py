@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification
+
+UNREAD_COUNT_KEY = 'unread_notifications:{}'
+UNREAD_CACHE_TIME = 60 * 60
+
+
+def _add_event(unread, actor_id):
+    return unread.update(
+        count=F('count') + 1,
+        actor_id=actor_id,
+        updated=timezone.now(),
+    )
+
+
+def notify(recipient_id, kind, actor_id, post_id=None):
+    """Записывает событие в уведомления получателя.
+
+    Пока уведомление того же вида о том же посте не прочитано, новые
+    события не добавляют строк, а увеличивают его счётчик: серия из
+    десятка комментариев - одно уведомление. Число непрочитанных при
+    этом не меняется, и кеш счётчика сбрасывается только при вставке.
+
+    Если параллельный вызов вставил уведомление первым, уникальный
+    индекс по непрочитанным отклоняет вторую вставку, и событие
+    добавляется к уже вставленному.
+    """
+    if recipient_id == actor_id:
+        return
+    unread = Notification.objects.filter(
+        recipient_id=recipient_id,
+        kind=kind,
+        post_id=post_id,
+        is_read=False,
+    )
+    if _add_event(unread, actor_id):
+        return
+    try:
+        with transaction.atomic():
+            Notification.objects.create(
+                recipient_id=recipient_id,
+                kind=kind,
+                post_id=post_id,
+                actor_id=actor_id,
+            )
+    except IntegrityError:
+        _add_event(unread, actor_id)
+        return
+    cache.delete(UNREAD_COUNT_KEY.format(recipient_id))
+
+
+def unread_count(user_id):
+    key = UNREAD_COUNT_KEY.format(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(
+            recipient_id=user_id, is_read=False
+        ).count()
+        cache.set(key, count, UNREAD_CACHE_TIME)
+    return count
+
+
+def mark_read(user_id, ids, shown_at):
+    """Отмечает прочитанными показанные уведомления ids.
+
+    Уведомление, получившее новое событие после shown_at, остаётся
+    непрочитанным: этого события пользователь ещё не видел.
+    """
+    if not ids:
+        return
+    Notification.objects.filter(
+        recipient_id=user_id,
+        pk__in=ids,
+        is_read=False,
+        updated__lte=shown_at,
+    ).update(is_read=True)
+    cache.delete(UNREAD_COUNT_KEY.format(user_id))
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-19 14:51
+
+from django.db import migrations, models
+
+
+def merge_duplicate_unread(apps, schema_editor):
+    Notification = apps.get_model('notifications', 'Notification')
+    groups = Notification.objects.filter(is_read=False).values(
+        'recipient', 'kind', 'post'
+    ).annotate(
+        rows=models.Count('id'), total=models.Sum('count')
+    ).filter(rows__gt=1)
+    for group in groups:
+        duplicates = Notification.objects.filter(
+            recipient=group['recipient'],
+            kind=group['kind'],
+            post=group['post'],
+            is_read=False,
+        ).order_by('-updated', '-id')
+        keep = duplicates.first()
+        duplicates.exclude(id=keep.id).delete()
+        keep.count = group['total']
+        keep.save(update_fields=['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_unread, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(is_read=False), fields=('recipient', 'kind', 'post'), name='unique_unread_notification'),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_read', False), ('post', None)), fields=('recipient', 'kind'), name='unique_unread_notification_no_post'),
+        ),
+    ]
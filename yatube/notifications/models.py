@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Notification(models.Model):
+    COMMENT = 'comment'
+    FOLLOW = 'follow'
+    KINDS = (
+        (COMMENT, 'Комментарии к посту'),
+        (FOLLOW, 'Новые подписчики'),
+    )
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Получатель'
+    )
+    kind = models.CharField(
+        verbose_name='Вид',
+        max_length=10,
+        choices=KINDS
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Пост',
+        null=True,
+        blank=True
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Последний автор события'
+    )
+    count = models.PositiveIntegerField(
+        verbose_name='Число событий',
+        default=1
+    )
+    is_read = models.BooleanField(
+        verbose_name='Прочитано',
+        default=False
+    )
+    updated = models.DateTimeField(
+        verbose_name='Последнее событие',
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = 'Уведомление'
+        verbose_name_plural = 'Уведомления'
+        ordering = ['-updated']
+        indexes = [
+            # Непрочитанные получателя: счётчик и склейка событий.
+            models.Index(
+                fields=('recipient', 'is_read', 'kind'),
+                name='notification_unread_idx'
+            ),
+            models.Index(
+                fields=('recipient', '-updated'),
+                name='notification_inbox_idx'
+            ),
+        ]
+        # Одно непрочитанное уведомление на вид и пост, см. notify.
+        # NULL в уникальном индексе не совпадает с NULL, поэтому для
+        # уведомлений без поста нужен отдельный индекс.
+        constraints = [
+            models.UniqueConstraint(
+                fields=('recipient', 'kind', 'post'),
+                condition=models.Q(is_read=False),
+                name='unique_unread_notification'
+            ),
+            models.UniqueConstraint(
+                fields=('recipient', 'kind'),
+                condition=models.Q(is_read=False, post=None),
+                name='unique_unread_notification_no_post'
+            ),
+        ]
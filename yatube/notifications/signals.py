@@ -0,0 +1,10 @@
+from django.dispatch import receiver
+from posts.signals import follow_toggled
+
+from .tasks import notify_follow
+
+
+@receiver(follow_toggled)
+def follow_notification(sender, user_id, author_id, following, **kwargs):
+    if following:
+        notify_follow.delay(user_id, author_id)
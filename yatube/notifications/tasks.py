@@ -0,0 +1,38 @@
+from posts.models import Comment, Follow
+from tasks.queue import task
+
+from .delivery import notify
+from .models import Notification
+
+
+@task
+def notify_comment(comment_id):
+    comment = Comment.objects.filter(pk=comment_id).values(
+        'author_id', 'post_id', 'post__author_id'
+    ).first()
+    if comment is None:
+        return
+    notify(
+        comment['post__author_id'],
+        Notification.COMMENT,
+        comment['author_id'],
+        post_id=comment['post_id'],
+    )
+
+
+@task
+def notify_follow(user_id, author_id):
+    # Пока задача ждала очереди, подписку могли отменить.
+    if not Follow.objects.filter(
+        user_id=user_id, author_id=author_id
+    ).exists():
+        return
+    # Повторное нажатие на кнопку не считается новым подписчиком.
+    if Notification.objects.filter(
+        recipient_id=author_id,
+        kind=Notification.FOLLOW,
+        is_read=False,
+        actor_id=user_id,
+    ).exists():
+        return
+    notify(author_id, Notification.FOLLOW, user_id)
@@ -0,0 +1,151 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from notifications import delivery
+from notifications.delivery import mark_read, unread_count
+from notifications.models import Notification
+from posts.models import Post, User
+from posts.utills import COUNT_POST
+from tasks.models import Task
+
+
+@override_settings(TASKS_BACKEND='eager')
+class NotificationsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_dev = User.objects.create_user(username='dev')
+        cls.user_arm = User.objects.create_user(username='arm')
+        cls.user_ann = User.objects.create_user(username='ann')
+        cls.post = Post.objects.create(text='пост', author=cls.user_dev)
+
+    def setUp(self):
+        cache.clear()
+
+    def comment(self, user, text='комментарий'):
+        self.client.force_login(user)
+        self.client.post(
+            reverse('posts:add_comment', args=(self.post.pk,)),
+            {'text': text}
+        )
+
+    def test_comment_burst_coalesced_into_one_notification(self):
+        for user in (self.user_arm, self.user_ann, self.user_arm):
+            self.comment(user)
+        self.comment(self.user_dev)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.recipient, self.user_dev)
+        self.assertEqual(notification.kind, Notification.COMMENT)
+        self.assertEqual(notification.count, 3)
+        self.assertEqual(notification.actor, self.user_arm)
+
+    def test_read_notification_starts_new_one(self):
+        self.comment(self.user_arm)
+        self.client.force_login(self.user_dev)
+        self.client.get(reverse('notifications:index'))
+
+        self.comment(self.user_ann)
+
+        self.assertEqual(
+            list(Notification.objects.values_list('count', 'is_read')),
+            [(1, False), (1, True)]
+        )
+
+    def test_only_shown_notifications_marked_read(self):
+        Notification.objects.bulk_create(
+            Notification(
+                recipient=self.user_dev,
+                kind=Notification.COMMENT,
+                post=Post.objects.create(text='пост', author=self.user_dev),
+                actor=self.user_arm,
+            )
+            for _ in range(COUNT_POST + 2)
+        )
+        self.client.force_login(self.user_dev)
+        self.client.get(reverse('notifications:index'))
+
+        self.assertEqual(unread_count(self.user_dev.pk), 2)
+
+    def test_event_after_page_load_stays_unread(self):
+        self.comment(self.user_arm)
+        shown_at = timezone.now()
+        self.comment(self.user_ann)
+
+        mark_read(
+            self.user_dev.pk,
+            Notification.objects.values_list('pk', flat=True),
+            shown_at
+        )
+
+        self.assertFalse(Notification.objects.get().is_read)
+
+    def test_concurrent_insert_added_to_existing(self):
+        self.comment(self.user_arm)
+        add_event = delivery._add_event
+        calls = []
+
+        def lose_race(unread, actor_id):
+            # Первое обновление не видит строку, как параллельный notify.
+            calls.append(actor_id)
+            return 0 if len(calls) == 1 else add_event(unread, actor_id)
+
+        with patch('notifications.delivery._add_event', lose_race):
+            self.comment(self.user_ann)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.count, 2)
+        self.assertEqual(notification.actor, self.user_ann)
+
+    def test_follow_notification(self):
+        self.client.force_login(self.user_arm)
+        for _ in range(2):
+            self.client.post(
+                reverse('posts:profile_follow', args=('dev',))
+            )
+        self.client.post(
+            reverse('posts:profile_unfollow', args=('dev',))
+        )
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.kind, Notification.FOLLOW)
+        self.assertEqual(notification.count, 1)
+        self.assertIsNone(notification.post)
+        self.assertEqual(notification.actor, self.user_arm)
+
+    @override_settings(TASKS_BACKEND='database')
+    def test_delivery_is_queued(self):
+        self.comment(self.user_arm)
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertTrue(
+            Task.objects.filter(
+                name='notifications.tasks.notify_comment'
+            ).exists()
+        )
+
+    def test_unread_count_cached(self):
+        self.comment(self.user_arm)
+        self.comment(self.user_ann)
+        self.assertEqual(unread_count(self.user_dev.pk), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_count(self.user_dev.pk), 1)
+
+        self.client.force_login(self.user_dev)
+        response = self.client.get(reverse('notifications:index'))
+        self.assertTemplateUsed(response, 'notifications/index.html')
+        self.assertEqual(len(response.context['page_obj']), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_count(self.user_dev.pk), 0)
+
+    def test_header_badge(self):
+        self.comment(self.user_arm)
+        self.client.force_login(self.user_dev)
+
+        response = self.client.get(reverse('about:author'))
+
+        self.assertContains(response, '<span class="badge bg-danger">1</span>')
@@ -0,0 +1,31 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+from django.utils import timezone
+from posts.utills import get_page
+
+from .delivery import mark_read
+from .models import Notification
+
+
+@login_required
+def index(request):
+    template = 'notifications/index.html'
+
+    shown_at = timezone.now()
+    page_obj = get_page(
+        request,
+        Notification.objects.filter(recipient=request.user).select_related(
+            'actor', 'post'
+        ).only(
+            'kind', 'count', 'is_read', 'updated',
+            'actor', 'actor__username', 'post', 'post__preview',
+        )
+    )
+    # Страница уже загружена и покажет, что было новым.
+    unread = [
+        notification.pk for notification in page_obj
+        if not notification.is_read
+    ]
+    mark_read(request.user.pk, unread, shown_at)
+
+    return render(request, template, {'page_obj': page_obj})
@@ -1,15 +1,19 @@
 from django.contrib import admin
 
-from .models import Follow, Group, Post
+from .models import (Follow, FollowSuggestion, Group, GroupStats, Mention,
+                     Post, PostRevision, Tag)
 
 
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'text', 'pub_date', 'author', 'group')
+    list_display = ('pk', 'text', 'pub_date', 'author', 'group', 'deleted')
     search_fields = ('text',)
     list_filter = ('pub_date',)
     list_editable = ('group',)
     empty_value_display = '-пусто-'
 
+    def get_queryset(self, request):
+        return Post.all_objects.select_related('author', 'group')
+
 
 class GroupAdmin(admin.ModelAdmin):
     list_display = ('pk', 'title', 'description', 'slug')
@@ -23,6 +27,35 @@ class FollowAdmin(admin.ModelAdmin):
     list_display_links = ('pk', 'user')
 
 
+class FollowSuggestionAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'user', 'author', 'score')
+    list_display_links = ('pk', 'user')
+
+
+class GroupStatsAdmin(admin.ModelAdmin):
+    list_display = ('group', 'post_count', 'last_post', 'dirty')
+
+
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name')
+    search_fields = ('name',)
+
+
+class MentionAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'user', 'post', 'comment')
+    raw_id_fields = ('user', 'post', 'comment')
+
+
+class PostRevisionAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'post', 'number', 'is_snapshot', 'created')
+    raw_id_fields = ('post',)
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Follow, FollowAdmin)
+admin.site.register(FollowSuggestion, FollowSuggestionAdmin)
+admin.site.register(GroupStats, GroupStatsAdmin)
+admin.site.register(Tag, TagAdmin)
+admin.site.register(Mention, MentionAdmin)
+admin.site.register(PostRevision, PostRevisionAdmin)
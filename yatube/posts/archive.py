@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+
+from .models import (ArchivedComment, ArchivedPost, Comment, Group, Post,
+                     User)
+
+BATCH_SIZE = 200
+
+
+def _copy(model, obj):
+    """Копия obj в архивной модели с теми же именами полей."""
+    return model(**{
+        field.attname: getattr(obj, field.attname)
+        for field in model._meta.concrete_fields
+    })
+
+
+def archive_posts(cutoff, batch_size=BATCH_SIZE):
+    """Переносит посты старше cutoff вместе с комментариями в архив.
+
+    Пачка постов блокируется в транзакции default до своего удаления:
+    новый комментарий к ней ждёт блокировки и не теряется каскадом.
+    Если архив в той же БД, копия и удаление атомарны; если в другой,
+    при сбое между ними повторный запуск пропустит уже перенесённое.
+    Мягко удалённые посты не архивируются, их удаляет purge_deleted.
+
+    Версии, хештеги и упоминания поста не переносятся и удаляются
+    каскадом: архивный пост показывается без истории правок и не
+    попадает на страницы тегов.
+    """
+    old_posts = Post.objects.filter(pub_date__lt=cutoff).order_by('pk')
+    count = 0
+    while True:
+        with transaction.atomic():
+            posts = list(old_posts.select_for_update()[:batch_size])
+            if not posts:
+                return count
+            _archive_batch(posts)
+        count += len(posts)
+
+
+def _archive_batch(posts):
+    ArchivedPost.objects.bulk_create(
+        (_copy(ArchivedPost, post) for post in posts),
+        ignore_conflicts=True
+    )
+    # Без блокировки строк (SQLite) комментарий может появиться уже
+    # после копирования; повторная выборка по pk подбирает такие.
+    last_pk = 0
+    while True:
+        comments = list(Comment.objects.filter(
+            post__in=posts, pk__gt=last_pk
+        ).order_by('pk'))
+        if not comments:
+            break
+        ArchivedComment.objects.bulk_create(
+            (_copy(ArchivedComment, comment) for comment in comments),
+            ignore_conflicts=True
+        )
+        last_pk = comments[-1].pk
+    Post.all_objects.filter(pk__in=[post.pk for post in posts]).delete()
+
+
+def purge_deleted(cutoff, batch_size=BATCH_SIZE):
+    """Окончательно удаляет посты, мягко удалённые раньше cutoff."""
+    deleted = Post.all_objects.filter(deleted__lt=cutoff).values_list(
+        'pk', flat=True
+    )
+    count = 0
+    while True:
+        ids = list(deleted[:batch_size])
+        if not ids:
+            return count
+        with transaction.atomic():
+            Post.all_objects.filter(pk__in=ids).delete()
+        count += len(ids)
+
+
+def run_archival(archive_after_days=None, retention_days=None):
+    """Архивация и очистка по настройкам; 0 дней - шаг пропускается."""
+    if archive_after_days is None:
+        archive_after_days = settings.ARCHIVE_AFTER_DAYS
+    if retention_days is None:
+        retention_days = settings.SOFT_DELETE_RETENTION_DAYS
+    now = timezone.now()
+    result = {'archived': 0, 'purged': 0}
+    if retention_days:
+        result['purged'] = purge_deleted(now - timedelta(days=retention_days))
+    if archive_after_days:
+        result['archived'] = archive_posts(
+            now - timedelta(days=archive_after_days)
+        )
+    return result
+
+
+def get_archived_post(post_id):
+    """Архивный пост с комментариями или Http404.
+
+    Архив может лежать в другой БД, поэтому авторы и группа читаются
+    отдельными запросами, без JOIN.
+    """
+    post = ArchivedPost.objects.filter(pk=post_id).first()
+    if post is None:
+        raise Http404('Пост не найден')
+    comments = list(post.comments.order_by('pk'))
+    users = User.objects.in_bulk(
+        {post.author_id, *(comment.author_id for comment in comments)}
+    )
+    if post.author_id not in users:
+        raise Http404('Пост не найден')
+
+    post.author = users[post.author_id]
+    post.group = (
+        Group.objects.filter(pk=post.group_id).first()
+        if post.group_id else None
+    )
+    for comment in comments:
+        comment.author = users.get(comment.author_id)
+    return post, [comment for comment in comments if comment.author]
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from ..following import get_following_ids
+
+
+def following(request):
+    """Добавляет id авторов, на которых подписан пользователь.
+
+    Множество загружается, только если шаблон к нему обратился.
+    """
+    return {
+        'following_ids': SimpleLazyObject(
+            lambda: get_following_ids(request)
+        ),
+        'card_follow_buttons': settings.CARD_FOLLOW_BUTTONS,
+    }
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from core.routers import use_replica
+
+from .models import Post
+
+AUTHOR_POST_COUNT_KEY = 'author_post_count:{}'
+COUNTER_CACHE_TIME = 60 * 60
+
+
+def author_post_count(author_id):
+    """Число постов автора; сбрасывается при создании и удалении постов.
+
+    Реплика может ещё не видеть пост, из-за которого счётчик сбросили,
+    поэтому прочитанное с неё число хранится только REPLICA_STICKY_TIME.
+    """
+    key = AUTHOR_POST_COUNT_KEY.format(author_id)
+    count = cache.get(key)
+    if count is None:
+        count = Post.objects.filter(author_id=author_id).count()
+        timeout = (
+            settings.REPLICA_STICKY_TIME if use_replica()
+            else COUNTER_CACHE_TIME
+        )
+        cache.add(key, count, timeout)
+    return count
+
+
+def forget_author_post_count(author_id):
+    cache.delete(AUTHOR_POST_COUNT_KEY.format(author_id))
@@ -0,0 +1,93 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.text import Truncator
+
+from .models import Follow, Post, User
+
+CHUNK_SIZE = 500
+POSTS_PER_DIGEST = 10
+PREVIEW_CHARS = 100
+
+
+def recipients(chunk_size=CHUNK_SIZE):
+    """Активные пользователи с почтой пачками по возрастанию pk."""
+    users = User.objects.filter(is_active=True).exclude(
+        email=''
+    ).order_by('pk').values_list('pk', 'email')
+    last_pk = 0
+    while True:
+        chunk = list(users.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def new_posts_by_user(user_ids, since):
+    """Новые посты авторов, на которых подписаны user_ids.
+
+    Два запроса на пачку вместо ленты на каждого: все подписки пачки,
+    затем все новые посты их авторов. Пост, который читают многие,
+    загружается один раз.
+    """
+    authors_by_user = defaultdict(set)
+    follows = Follow.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'author_id'
+    )
+    for user_id, author_id in follows:
+        authors_by_user[user_id].add(author_id)
+    if not authors_by_user:
+        return {}
+
+    posts_by_author = defaultdict(list)
+    posts = Post.objects.filter(
+        author_id__in=set().union(*authors_by_user.values()),
+        pub_date__gte=since,
+    ).values_list('pk', 'author_id', 'author__username', 'preview')
+    for post in posts:
+        posts_by_author[post[1]].append(post)
+
+    return {
+        user_id: sorted(
+            (post for author_id in authors
+             for post in posts_by_author[author_id]),
+            reverse=True
+        )
+        for user_id, authors in authors_by_user.items()
+    }
+
+
+def digest_message(email, posts, site_url):
+    lines = [
+        f'{username}: {Truncator(preview).chars(PREVIEW_CHARS)}\n'
+        f'{site_url}{reverse("posts:post_detail", args=(pk,))}'
+        for pk, _, username, preview in posts[:POSTS_PER_DIGEST]
+    ]
+    if len(posts) > POSTS_PER_DIGEST:
+        lines.append(
+            f'И ещё {len(posts) - POSTS_PER_DIGEST}: '
+            f'{site_url}{reverse("posts:follow_index")}'
+        )
+    return (
+        f'Новые записи ваших подписок: {len(posts)}',
+        '\n\n'.join(lines),
+        settings.DEFAULT_FROM_EMAIL,
+        [email],
+    )
+
+
+def build_digests(since, chunk_size=CHUNK_SIZE, site_url=None):
+    """Письма-дайджесты пачками, готовые для send_mass_mail.
+
+    Пользователи без новых постов в подписках писем не получают.
+    """
+    site_url = (site_url or settings.SITE_URL).rstrip('/')
+    for chunk in recipients(chunk_size):
+        posts_by_user = new_posts_by_user([pk for pk, _ in chunk], since)
+        yield [
+            digest_message(email, posts_by_user[pk], site_url)
+            for pk, email in chunk
+            if posts_by_user.get(pk)
+        ]
@@ -0,0 +1,35 @@
+from django.core.cache import cache
+
+from .models import Follow
+
+FOLLOWING_CACHE_KEY = 'following:{}'
+# Подписки, удалённые в обход представлений (админка, каскад), видны
+# не позже чем через это время.
+FOLLOWING_CACHE_TIME = 300
+
+
+def following_ids(user):
+    """Множество id авторов, на которых подписан пользователь."""
+    if not user.is_authenticated:
+        return frozenset()
+    key = FOLLOWING_CACHE_KEY.format(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(
+            Follow.objects.filter(user_id=user.pk).values_list(
+                'author_id', flat=True
+            )
+        )
+        cache.set(key, ids, FOLLOWING_CACHE_TIME)
+    return ids
+
+
+def get_following_ids(request):
+    """following_ids текущего пользователя, один раз за запрос."""
+    if not hasattr(request, '_following_ids'):
+        request._following_ids = following_ids(request.user)
+    return request._following_ids
+
+
+def forget_following(user_id):
+    cache.delete(FOLLOWING_CACHE_KEY.format(user_id))
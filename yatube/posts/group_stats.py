@@ -0,0 +1,56 @@
+import json
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from .models import Group, GroupStats, Post
+
+TOP_AUTHORS = 3
+
+
+def refresh_group_stats(full=False):
+    """Пересчитывает статистику новых и помеченных групп.
+
+    Число постов, дата последнего и активные авторы получаются одним
+    агрегирующим запросом по парам (группа, автор). Возвращает число
+    пересчитанных групп.
+    """
+    groups = Group.objects.all()
+    if not full:
+        groups = groups.filter(Q(stats__isnull=True) | Q(stats__dirty=True))
+    group_ids = list(groups.values_list('pk', flat=True))
+    if not group_ids:
+        return 0
+
+    rows = Post.objects.filter(group_id__in=group_ids).values_list(
+        'group_id', 'author__username'
+    ).annotate(Count('pk'), Max('pub_date')).order_by()
+
+    authors = defaultdict(list)
+    for group_id, username, post_count, last_post in rows:
+        authors[group_id].append((post_count, last_post, username))
+
+    stats = []
+    for group_id in group_ids:
+        group_authors = authors[group_id]
+        group_authors.sort(key=lambda author: (-author[0], author[2]))
+        stats.append(GroupStats(
+            group_id=group_id,
+            post_count=sum(author[0] for author in group_authors),
+            last_post=max(
+                (author[1] for author in group_authors), default=None
+            ),
+            top_authors=json.dumps(
+                [author[2] for author in group_authors[:TOP_AUTHORS]]
+            ),
+        ))
+    with transaction.atomic():
+        GroupStats.objects.filter(group_id__in=group_ids).delete()
+        GroupStats.objects.bulk_create(stats)
+    return len(group_ids)
+
+
+def mark_group_dirty(group_id):
+    if group_id is not None:
+        GroupStats.objects.filter(group_id=group_id).update(dirty=True)
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import router
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_save)
+from django.http import Http404
+
+from .models import Group, User
+
+# Сколько секунд объект живёт в памяти процесса. Изменения из других
+# процессов доходят только через общий кеш, поэтому срок короткий.
+LOCAL_TTL = 30
+LOCAL_SIZE = 1024
+CACHE_TIME = 300
+
+
+class IdentityCache:
+    """Объекты модели по уникальному полю: LRU процесса и общий кеш.
+
+    Записи сбрасываются сигналами сохранения и удаления модели, в том
+    числе по старому значению поля при его изменении. Старое значение
+    запоминается при загрузке объекта, так что сохранение не делает
+    лишнего SELECT.
+    """
+
+    def __init__(self, model, field, fields=None, ignore_fields=()):
+        self.model = model
+        self.field = field
+        # Только эти поля попадают в кеш; остальные отложены и при
+        # обращении читаются из БД.
+        self.fields = fields
+        # Сохранение только этих полей не сбрасывает запись.
+        self.ignore_fields = frozenset(ignore_fields)
+        self.prefix = f'identity:{model._meta.label_lower}:{field}'
+        self.attname = model._meta.get_field(field).attname
+        self.loaded_attr = f'_identity_loaded_{field}'
+        self.local = OrderedDict()
+        self.lock = threading.Lock()
+        post_init.connect(self.remember_loaded, sender=model, weak=False)
+        pre_save.connect(self.field_changing, sender=model, weak=False)
+        post_save.connect(self.remember_loaded, sender=model, weak=False)
+        post_save.connect(self.object_changed, sender=model, weak=False)
+        post_delete.connect(self.object_changed, sender=model, weak=False)
+
+    def key(self, value):
+        return f'{self.prefix}:{value}'
+
+    def get(self, value):
+        """Объект с field=value; DoesNotExist, если его нет."""
+        with self.lock:
+            entry = self.local.get(value)
+            if entry is not None and entry[1] > time.monotonic():
+                self.local.move_to_end(value)
+                return entry[0]
+
+        obj = cache.get(self.key(value))
+        if obj is None:
+            # Запись живёт в кеше минуты, поэтому читается из основной
+            # БД, а не из реплики, которая может отставать.
+            objects = self.model.objects.using(
+                router.db_for_write(self.model)
+            )
+            if self.fields is not None:
+                objects = objects.only(self.field, *self.fields)
+            obj = objects.get(**{self.field: value})
+            cache.set(self.key(value), obj, CACHE_TIME)
+
+        with self.lock:
+            self.local[value] = (obj, time.monotonic() + LOCAL_TTL)
+            self.local.move_to_end(value)
+            if len(self.local) > LOCAL_SIZE:
+                self.local.popitem(last=False)
+        return obj
+
+    def get_or_404(self, value):
+        try:
+            return self.get(value)
+        except self.model.DoesNotExist:
+            raise Http404(f'{self.model._meta.object_name} not found')
+
+    def forget(self, value):
+        with self.lock:
+            self.local.pop(value, None)
+        cache.delete(self.key(value))
+
+    def remember_loaded(self, sender, instance, update_fields=None,
+                        **kwargs):
+        if update_fields is not None and self.field not in update_fields:
+            return
+        # Отложенное поле не читаем: это был бы запрос на каждый объект.
+        if self.attname in instance.__dict__:
+            instance.__dict__[self.loaded_attr] = (
+                instance.__dict__[self.attname]
+            )
+
+    def loaded_value(self, instance):
+        """Значение поля в БД: запомненное при загрузке или из запроса.
+
+        Запрос нужен, только если объект собран вручную с pk или поле
+        было отложено при загрузке.
+        """
+        if not instance._state.adding and self.loaded_attr in vars(instance):
+            return vars(instance)[self.loaded_attr]
+        return type(instance).objects.filter(pk=instance.pk).values_list(
+            self.field, flat=True
+        ).first()
+
+    def field_changing(self, sender, instance, update_fields=None, **kwargs):
+        if instance.pk is None:
+            return
+        if update_fields is not None and self.field not in update_fields:
+            return
+        old_value = self.loaded_value(instance)
+        if old_value is not None and old_value != getattr(
+            instance, self.field
+        ):
+            self.forget(old_value)
+
+    def object_changed(self, sender, instance, update_fields=None,
+                       **kwargs):
+        if update_fields and self.ignore_fields.issuperset(update_fields):
+            return
+        self.forget(getattr(instance, self.field))
+
+
+groups_by_slug = IdentityCache(Group, 'slug')
+# Хеш пароля и почта в общий кеш не попадают, см. users/auth.py.
+users_by_username = IdentityCache(
+    User,
+    'username',
+    fields=('first_name', 'last_name'),
+    ignore_fields=('last_login',)
+)
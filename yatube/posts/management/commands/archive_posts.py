@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...archive import run_archival
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит старые посты с комментариями в архив и окончательно '
+        'удаляет давно удалённые посты.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+            help='Архивировать посты старше стольких дней, 0 - нет.'
+        )
+        parser.add_argument(
+            '--purge-days', type=int,
+            default=settings.SOFT_DELETE_RETENTION_DAYS,
+            help='Удалять посты, удалённые раньше стольких дней назад.'
+        )
+
+    def handle(self, *args, **options):
+        result = run_archival(options['days'], options['purge_days'])
+        for name, count in result.items():
+            self.stdout.write(f'{name.capitalize()}: {count}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ...tagging import BATCH_SIZE, reindex_all
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет хештеги и упоминания для уже написанных постов '
+        'и комментариев. Работает пачками по --batch-size записей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        for model, count in reindex_all(options['batch_size']).items():
+            self.stdout.write(f'{model.__name__}: {count}')
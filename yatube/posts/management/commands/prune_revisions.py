@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...revisions import REVISIONS_KEPT, prune_revisions
+
+
+class Command(BaseCommand):
+    help = 'Удаляет старые версии постов, оставляя --keep последних.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=REVISIONS_KEPT)
+
+    def handle(self, *args, **options):
+        if options['keep'] < 1:
+            raise CommandError('--keep должен быть не меньше 1')
+        count = prune_revisions(options['keep'])
+        self.stdout.write(f'Revisions: {count}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ...ranking import recompute_scores
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг новых и изменившихся постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Пересчитать все посты.'
+        )
+
+    def handle(self, *args, **options):
+        count = recompute_scores(full=options['full'])
+        self.stdout.write(f'Recomputed: {count}')
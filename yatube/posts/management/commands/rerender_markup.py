@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from ...rendering import rerender_all
+
+
+class Command(BaseCommand):
+    help = (
+        'Перерисовывает HTML постов и комментариев, отрисованных старой '
+        'версией разметки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перерисовать все тексты.'
+        )
+
+    def handle(self, *args, **options):
+        for model, count in rerender_all(full=options['all']).items():
+            self.stdout.write(f'{model.__name__}: {count}')
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.mail import get_connection, send_mass_mail
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...digest import CHUNK_SIZE, build_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Рассылает дайджест новых постов из подписок за последние '
+        '--hours часов. Запускается раз в сутки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24)
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(hours=options['hours'])
+        sent = 0
+        # Одно подключение на всю рассылку, а не на каждое письмо.
+        with get_connection() as connection:
+            for messages in build_digests(since, options['chunk_size']):
+                if messages:
+                    sent += send_mass_mail(messages, connection=connection)
+        self.stdout.write(f'Digests: {sent}')
@@ -0,0 +1,97 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.html import escape
+
+# Увеличивается при любом изменении разметки; после выкладки команда
+# rerender_markup перерисует все тексты со старой версией.
+RENDER_VERSION = 2
+
+TAG_MAX_LENGTH = 50
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+MENTION = re.compile(r'(?<![\w.@])@(?P<username>[\w.+-]*\w)')
+HASHTAG = re.compile(
+    rf'(?<![\w&#/])#(?P<tag>\w{{1,{TAG_MAX_LENGTH}}})(?!\w)'
+)
+TOKEN = re.compile(
+    r'`(?P<code>[^`\n]+)`'
+    r'|(?P<url>https?://[^\s<>"\']*[^\s<>"\'.,;:!?)\]])'
+    rf'|{MENTION.pattern}'
+    rf'|{HASHTAG.pattern}'
+    r'|\*\*(?P<strong>[^*\n]+)\*\*'
+    r'|(?<![\w*])[*_](?P<em>[^*_\n]+)[*_](?![\w*])'
+)
+
+
+def extract_tags(text):
+    """Названия хештегов текста в нижнем регистре."""
+    return {match.group('tag').lower() for match in HASHTAG.finditer(text)}
+
+
+def extract_usernames(text):
+    return {match.group('username') for match in MENTION.finditer(text)}
+
+
+def existing_usernames(texts):
+    """Упомянутые в текстах имена, которые есть среди пользователей."""
+    names = set().union(*map(extract_usernames, texts))
+    if not names:
+        return set()
+    return set(
+        get_user_model().objects.filter(username__in=names).values_list(
+            'username', flat=True
+        )
+    )
+
+
+def render_markup(text, usernames=frozenset()):
+    """Переводит текст в HTML: абзацы, ссылки, @упоминания, #хештеги,
+    **жирный**, *курсив* и `код`.
+
+    Весь пользовательский текст экранируется, теги создаёт только сам
+    рендерер, поэтому результат можно выводить без очистки. Упоминания
+    становятся ссылками, только если имя есть в usernames.
+    """
+    paragraphs = PARAGRAPH_BREAK.split(text.strip())
+    return ''.join(
+        '<p>{}</p>'.format('<br>'.join(
+            _render_inline(line, usernames)
+            for line in paragraph.splitlines()
+        ))
+        for paragraph in paragraphs if paragraph
+    )
+
+
+def _render_inline(text, usernames):
+    parts = []
+    position = 0
+    for match in TOKEN.finditer(text):
+        parts.append(escape(text[position:match.start()]))
+        parts.append(_render_token(match, usernames))
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return ''.join(parts)
+
+
+def _render_token(match, usernames):
+    if match.group('code') is not None:
+        return f'<code>{escape(match.group("code"))}</code>'
+    if match.group('url') is not None:
+        url = escape(match.group('url'))
+        return f'<a href="{url}" rel="nofollow noopener">{url}</a>'
+    if match.group('username') is not None:
+        username = match.group('username')
+        if username not in usernames:
+            return escape(match.group(0))
+        url = reverse('posts:profile', args=(username,))
+        return f'<a href="{escape(url)}">@{escape(username)}</a>'
+    if match.group('tag') is not None:
+        tag = match.group('tag')
+        url = reverse('posts:tag_posts', args=(tag.lower(),))
+        return f'<a href="{escape(url)}">#{escape(tag)}</a>'
+    if match.group('strong') is not None:
+        strong = _render_inline(match.group('strong'), usernames)
+        return f'<strong>{strong}</strong>'
+    return f'<em>{_render_inline(match.group("em"), usernames)}</em>'
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-19 14:01
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_previews(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    for start in range(0, len(post_ids), 500):
+        posts = list(
+            Post.objects.filter(pk__in=post_ids[start:start + 500]).only('text')
+        )
+        for post in posts:
+            post.preview = Truncator(post.text).chars(300)
+        Post.objects.bulk_update(posts, ['preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_groupstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='preview',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_previews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+from django.utils.text import Truncator
+
+
+def fill_empty_previews(apps, schema_editor):
+    # Посты, созданные bulk_create после 0013, остались без начала текста.
+    Post = apps.get_model('posts', 'Post')
+    post_ids = list(
+        Post.objects.filter(preview='').values_list('pk', flat=True)
+    )
+    for start in range(0, len(post_ids), 500):
+        posts = list(
+            Post.objects.filter(pk__in=post_ids[start:start + 500]).only('text')
+        )
+        for post in posts:
+            post.preview = Truncator(post.text).chars(300)
+        Post.objects.bulk_update(posts, ['preview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_postrevision'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_empty_previews, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,96 @@
+import json
+
 from core.models import CreatedModel
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .markup import (RENDER_VERSION, TAG_MAX_LENGTH, existing_usernames,
+                     render_markup)
 
 User = get_user_model()
 
+PREVIEW_LENGTH = 300
+
+
+class RenderedTextModel(models.Model):
+    """Модель с текстом, HTML которого рисуется при сохранении."""
+
+    text_html = models.TextField(
+        verbose_name='Текст в HTML',
+        blank=True,
+        editable=False
+    )
+    render_version = models.PositiveSmallIntegerField(
+        verbose_name='Версия разметки',
+        default=0,
+        editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    def render_text(self, usernames=None):
+        if usernames is None:
+            usernames = existing_usernames([self.text])
+        self.text_html = render_markup(self.text, usernames)
+        self.render_version = RENDER_VERSION
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.render_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'text_html', 'render_version'
+                }
+        super().save(*args, **kwargs)
+
+
+class PostQuerySet(models.QuerySet):
+
+    def for_feed(self, *fields):
+        """Только поля, нужные карточке в ленте, и fields.
+
+        Полный текст и служебные поля автора (пароль, почта) не читаются,
+        если их не запросили явно.
+        """
+        return self.select_related('author', 'group').only(
+            'pub_date', 'preview', 'image',
+            'author', 'author__username',
+            'group', 'group__title', 'group__slug',
+            *fields
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create не вызывает save(): начало текста заполняем здесь,
+        # чтобы ленты никогда не читали полный текст.
+        objs = list(objs)
+        for obj in objs:
+            if not obj.preview:
+                obj.preview = obj.make_preview(obj.text)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """Посты без мягко удалённых."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted__isnull=True)
 
-class Post(models.Model):
+
+class Post(RenderedTextModel):
     text = models.TextField(
         verbose_name='Описание',
         help_text='описание'
     )
+    preview = models.CharField(
+        verbose_name='Начало текста',
+        max_length=PREVIEW_LENGTH,
+        blank=True,
+        editable=False
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
         auto_now_add=True,
@@ -35,6 +116,15 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    deleted = models.DateTimeField(
+        verbose_name='Дата удаления',
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    objects = PostManager()
+    all_objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Пост'
@@ -44,6 +134,31 @@ class Post(models.Model):
     def __str__(self):
         return self.text[:15]
 
+    @staticmethod
+    def make_preview(text):
+        return Truncator(text).chars(PREVIEW_LENGTH)
+
+    @property
+    def is_truncated(self):
+        return (
+            len(self.preview) == PREVIEW_LENGTH
+            and self.preview.endswith('…')
+        )
+
+    def soft_delete(self):
+        """Скрывает пост; комментарии остаются до окончательного
+        удаления архивацией."""
+        self.deleted = timezone.now()
+        self.save(update_fields=['deleted'])
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.preview = self.make_preview(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'preview'}
+        super().save(*args, **kwargs)
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200)
@@ -58,7 +173,7 @@ class Group(models.Model):
         return self.title
 
 
-class Comment(CreatedModel):
+class Comment(CreatedModel, RenderedTextModel):
     text = models.TextField(verbose_name='Комментарий')
     post = models.ForeignKey(
         Post,
@@ -87,3 +202,287 @@ class Follow(models.Model):
         related_name='following',
         verbose_name='Автор'
     )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='unique_follow'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='no_self_follow'
+            ),
+        ]
+
+
+class PostScore(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score',
+        verbose_name='Пост'
+    )
+    score = models.FloatField(verbose_name='Рейтинг', db_index=True)
+    dirty = models.BooleanField(
+        verbose_name='Требует пересчёта',
+        default=False,
+        db_index=True
+    )
+    computed = models.DateTimeField(
+        verbose_name='Дата расчёта',
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = 'Рейтинг поста'
+        verbose_name_plural = 'Рейтинги постов'
+        ordering = ['-score']
+
+
+class FollowSuggestion(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follow_suggestions',
+        verbose_name='Пользователь'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Рекомендуемый автор'
+    )
+    score = models.FloatField(verbose_name='Вес')
+
+    class Meta:
+        verbose_name = 'Рекомендация подписки'
+        verbose_name_plural = 'Рекомендации подписок'
+        ordering = ['-score']
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='unique_follow_suggestion'
+            ),
+        ]
+
+
+class GroupStats(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Группа'
+    )
+    post_count = models.PositiveIntegerField(
+        verbose_name='Число постов',
+        default=0,
+        db_index=True
+    )
+    last_post = models.DateTimeField(
+        verbose_name='Последний пост',
+        null=True,
+        blank=True
+    )
+    top_authors = models.TextField(
+        verbose_name='Самые активные авторы (JSON)',
+        default='[]'
+    )
+    dirty = models.BooleanField(
+        verbose_name='Требует пересчёта',
+        default=False,
+        db_index=True
+    )
+
+    class Meta:
+        verbose_name = 'Статистика группы'
+        verbose_name_plural = 'Статистика групп'
+
+    @property
+    def top_author_names(self):
+        return json.loads(self.top_authors)
+
+
+class Tag(models.Model):
+    name = models.CharField(
+        verbose_name='Название',
+        max_length=TAG_MAX_LENGTH,
+        unique=True
+    )
+
+    class Meta:
+        verbose_name = 'Хештег'
+        verbose_name_plural = 'Хештеги'
+
+    def __str__(self):
+        return f'#{self.name}'
+
+
+class TaggedPost(models.Model):
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='tagged',
+        verbose_name='Хештег'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='tagged',
+        verbose_name='Пост'
+    )
+
+    class Meta:
+        verbose_name = 'Хештег поста'
+        verbose_name_plural = 'Хештеги постов'
+        constraints = [
+            # Индекс (tag, post) обслуживает ленту хештега целиком:
+            # поиск по тегу и курсор по pk поста.
+            models.UniqueConstraint(
+                fields=('tag', 'post'),
+                name='unique_tagged_post'
+            ),
+        ]
+
+
+class Mention(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='mentions',
+        verbose_name='Упомянутый пользователь'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='mentions',
+        verbose_name='Пост'
+    )
+    comment = models.ForeignKey(
+        Comment,
+        on_delete=models.CASCADE,
+        related_name='mentions',
+        verbose_name='Комментарий',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Упоминание'
+        verbose_name_plural = 'Упоминания'
+        ordering = ['-pk']
+        indexes = [
+            models.Index(fields=('user', '-id'), name='mention_user_idx'),
+        ]
+
+
+class PostRevision(CreatedModel):
+    """Версия текста поста после правки.
+
+    Обычно хранится разница с предыдущей версией (JSON из замен строк),
+    а каждая SNAPSHOT_EVERY-я версия - целиком, чтобы восстановление
+    любой версии требовало не больше SNAPSHOT_EVERY шагов.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='revisions',
+        verbose_name='Пост'
+    )
+    number = models.PositiveIntegerField(verbose_name='Номер версии')
+    is_snapshot = models.BooleanField(
+        verbose_name='Полный текст',
+        default=False
+    )
+    data = models.TextField(verbose_name='Текст или разница')
+
+    class Meta:
+        verbose_name = 'Версия поста'
+        verbose_name_plural = 'Версии постов'
+        ordering = ['number']
+        constraints = [
+            models.UniqueConstraint(
+                fields=('post', 'number'),
+                name='unique_post_revision'
+            ),
+        ]
+
+
+class ArchivedPost(models.Model):
+    """Пост, перенесённый из горячей таблицы архивацией.
+
+    Поля повторяют Post. Архив может лежать в отдельной БД, поэтому
+    внешние ключи без ограничений в базе.
+    """
+
+    text = models.TextField(verbose_name='Описание')
+    text_html = models.TextField(verbose_name='Текст в HTML', blank=True)
+    render_version = models.PositiveSmallIntegerField(
+        verbose_name='Версия разметки',
+        default=0
+    )
+    preview = models.CharField(
+        verbose_name='Начало текста',
+        max_length=PREVIEW_LENGTH,
+        blank=True
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name='Автор'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name='Группа',
+        null=True,
+        blank=True
+    )
+    image = models.ImageField(
+        verbose_name='Картинка',
+        upload_to='posts/',
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+        ordering = ['-pub_date']
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='Пост'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name='Автор'
+    )
+    text = models.TextField(verbose_name='Комментарий')
+    text_html = models.TextField(verbose_name='Текст в HTML', blank=True)
+    render_version = models.PositiveSmallIntegerField(
+        verbose_name='Версия разметки',
+        default=0
+    )
+    created = models.DateTimeField('Дата создания')
+
+    class Meta:
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
@@ -0,0 +1,79 @@
+import math
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Comment, Follow, Post, PostScore
+
+RANK_EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+# За столько секунд свежесть прибавляет к рейтингу столько же, сколько
+# десятикратный рост активности.
+RANK_DECAY = 45000
+FOLLOWER_WEIGHT = 0.1
+BATCH_SIZE = 500
+
+
+def compute_score(pub_date, comment_count, follower_count):
+    """Рейтинг с затуханием по времени, не требующий пересчёта.
+
+    Свежесть входит в рейтинг как слагаемое, поэтому порядок постов со
+    временем не меняется: пересчитывать нужно только посты с новой
+    активностью.
+    """
+    activity = comment_count + FOLLOWER_WEIGHT * follower_count
+    age = (pub_date - RANK_EPOCH).total_seconds()
+    return math.log10(1 + activity) + age / RANK_DECAY
+
+
+def recompute_scores(full=False):
+    """Пересчитывает новые и помеченные посты; возвращает их число."""
+    posts = Post.objects.all()
+    if not full:
+        posts = posts.filter(Q(score__isnull=True) | Q(score__dirty=True))
+    post_ids = list(posts.values_list('pk', flat=True))
+
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        _recompute_batch(post_ids[start:start + BATCH_SIZE])
+    return len(post_ids)
+
+
+def _recompute_batch(post_ids):
+    posts = list(
+        Post.objects.filter(pk__in=post_ids).values_list(
+            'pk', 'pub_date', 'author_id'
+        )
+    )
+    comment_counts = dict(
+        Comment.objects.filter(post_id__in=post_ids).values_list(
+            'post_id'
+        ).annotate(Count('pk'))
+    )
+    follower_counts = dict(
+        Follow.objects.filter(
+            author_id__in={author_id for _, _, author_id in posts}
+        ).values_list('author_id').annotate(Count('pk'))
+    )
+    scores = [
+        PostScore(
+            post_id=pk,
+            score=compute_score(
+                pub_date,
+                comment_counts.get(pk, 0),
+                follower_counts.get(author_id, 0)
+            )
+        )
+        for pk, pub_date, author_id in posts
+    ]
+    with transaction.atomic():
+        PostScore.objects.filter(post_id__in=post_ids).delete()
+        PostScore.objects.bulk_create(scores)
+
+
+def mark_post_dirty(post_id):
+    PostScore.objects.filter(post_id=post_id).update(dirty=True)
+
+
+def mark_author_dirty(author_id):
+    PostScore.objects.filter(post__author_id=author_id).update(dirty=True)
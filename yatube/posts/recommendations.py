@@ -0,0 +1,99 @@
+import math
+from collections import Counter, defaultdict
+from heapq import nlargest
+
+from django.db import transaction
+
+from .following import get_following_ids
+from .models import Follow, FollowSuggestion
+
+SUGGESTIONS_PER_USER = 10
+# Сколько самых похожих авторов хранить для каждого автора.
+SIMILAR_AUTHORS = 50
+FRIENDS_OF_FRIENDS_WEIGHT = 1.0
+CO_FOLLOW_WEIGHT = 2.0
+BATCH_SIZE = 1000
+
+
+def load_graph():
+    """Списки смежности графа подписок: кто на кого и кто кого читает."""
+    following = defaultdict(set)
+    followers = defaultdict(set)
+    edges = Follow.objects.values_list('user_id', 'author_id').iterator()
+    for user_id, author_id in edges:
+        following[user_id].add(author_id)
+        followers[author_id].add(user_id)
+    return following, followers
+
+
+def similar_authors(following, followers):
+    """Косинусная близость авторов по общим подписчикам.
+
+    Для каждого автора остаются SIMILAR_AUTHORS самых близких.
+    """
+    similar = {}
+    for author_id, readers in followers.items():
+        co_follows = Counter()
+        for reader_id in readers:
+            co_follows.update(following[reader_id])
+        del co_follows[author_id]
+        similar[author_id] = nlargest(
+            SIMILAR_AUTHORS,
+            (
+                (other_id, count / math.sqrt(
+                    len(readers) * len(followers[other_id])
+                ))
+                for other_id, count in co_follows.items()
+            ),
+            key=lambda item: item[1]
+        )
+    return similar
+
+
+def suggest(user_id, following, similar):
+    """Лучшие авторы для user_id: друзья друзей и похожие на читаемых."""
+    followed = following[user_id]
+    scores = Counter()
+    for author_id in followed:
+        for candidate_id in following.get(author_id, ()):
+            scores[candidate_id] += FRIENDS_OF_FRIENDS_WEIGHT
+        for candidate_id, similarity in similar.get(author_id, ()):
+            scores[candidate_id] += CO_FOLLOW_WEIGHT * similarity
+    for excluded_id in followed | {user_id}:
+        scores.pop(excluded_id, None)
+    return scores.most_common(SUGGESTIONS_PER_USER)
+
+
+def build_suggestions():
+    """Пересчитывает таблицу рекомендаций по всему графу подписок.
+
+    Граф читается одним запросом и считается в памяти до начала
+    транзакции: запись в SQLite блокирует базу, и веб-запросы ждали бы
+    весь расчёт. В транзакции только удаление старых рекомендаций и
+    вставка пачками. Возвращает число сохранённых рекомендаций.
+    """
+    following, followers = load_graph()
+    similar = similar_authors(following, followers)
+    suggestions = [
+        FollowSuggestion(user_id=user_id, author_id=author_id, score=score)
+        for user_id in following
+        for author_id, score in suggest(user_id, following, similar)
+    ]
+
+    with transaction.atomic():
+        FollowSuggestion.objects.all().delete()
+        FollowSuggestion.objects.bulk_create(
+            suggestions, batch_size=BATCH_SIZE
+        )
+    return len(suggestions)
+
+
+def get_suggestions(request, limit=5):
+    """Готовые рекомендации для текущего пользователя."""
+    if not request.user.is_authenticated:
+        return []
+    return list(
+        FollowSuggestion.objects.filter(user_id=request.user.pk).exclude(
+            author_id__in=get_following_ids(request)
+        ).select_related('author')[:limit]
+    )
@@ -0,0 +1,33 @@
+from .markup import RENDER_VERSION, existing_usernames
+from .models import Comment, Post
+
+BATCH_SIZE = 500
+
+
+def rerender(model, full=False):
+    """Перерисовывает HTML текстов со старой версией разметки.
+
+    Запускается командой rerender_markup при выкладке новой версии.
+    Идёт пачками по возрастанию pk, как tagging.reindex: на пачку один
+    запрос за текстами, один за упомянутыми пользователями и одно
+    массовое обновление; в памяти не больше пачки.
+    """
+    objects = model.objects.only('text').order_by('pk')
+    if not full:
+        objects = objects.filter(render_version__lt=RENDER_VERSION)
+    count = 0
+    last_pk = 0
+    while True:
+        batch = list(objects.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            return count
+        usernames = existing_usernames(obj.text for obj in batch)
+        for obj in batch:
+            obj.render_text(usernames)
+        model.objects.bulk_update(batch, ['text_html', 'render_version'])
+        count += len(batch)
+        last_pk = batch[-1].pk
+
+
+def rerender_all(full=False):
+    return {model: rerender(model, full) for model in (Post, Comment)}
@@ -0,0 +1,146 @@
+import json
+from difflib import SequenceMatcher, unified_diff
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import Post, PostRevision
+
+SNAPSHOT_EVERY = 10
+REVISIONS_KEPT = 50
+
+
+def make_delta(old, new):
+    """Замены строк, превращающие old в new: [[начало, конец, строки]]."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [
+        [i1, i2, new_lines[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != 'equal'
+    ]
+
+
+def apply_delta(old, delta):
+    old_lines = old.splitlines(keepends=True)
+    lines = []
+    position = 0
+    for start, end, new_lines in delta:
+        lines.extend(old_lines[position:start])
+        lines.extend(new_lines)
+        position = end
+    lines.extend(old_lines[position:])
+    return ''.join(lines)
+
+
+def record_revision(post, old_text):
+    """Сохраняет версию после правки поста.
+
+    Первая правка сохраняет и исходный текст. Если текст меняли в обход
+    post_edit (админка, shell, миграция) и он расходится с последней
+    версией, old_text сохраняется целиком: иначе разница применялась бы
+    не к тому тексту. Если разница не короче текста, версия тоже
+    хранится целиком.
+
+    Вызывается в транзакции с заблокированной строкой поста, см.
+    save_with_revision.
+    """
+    if post.text == old_text:
+        return
+    last = post.revisions.aggregate(last=Max('number'))['last']
+    last_text = revision_texts(post.pk, last, last).get(last) if last else None
+    revisions = []
+    if last_text != old_text:
+        last = (last or 0) + 1
+        revisions.append(PostRevision(
+            post=post, number=last, is_snapshot=True, data=old_text
+        ))
+
+    number = last + 1
+    delta = json.dumps(make_delta(old_text, post.text), ensure_ascii=False)
+    is_snapshot = number % SNAPSHOT_EVERY == 1 or len(delta) >= len(post.text)
+    revisions.append(PostRevision(
+        post=post,
+        number=number,
+        is_snapshot=is_snapshot,
+        data=post.text if is_snapshot else delta,
+    ))
+    PostRevision.objects.bulk_create(revisions)
+
+
+def save_with_revision(post, save):
+    """Сохраняет пост функцией save и записывает версию.
+
+    Строка поста блокируется до конца транзакции: параллельные правки
+    нумеруют версии по очереди, а правка без версии не сохраняется.
+    Прежний текст читается из БД под блокировкой, а не из формы.
+    """
+    with transaction.atomic():
+        old_text = Post.objects.select_for_update().filter(
+            pk=post.pk
+        ).values_list('text', flat=True).get()
+        post = save()
+        record_revision(post, old_text)
+    return post
+
+
+def revision_texts(post_id, first, last):
+    """Тексты версий с first по last одним запросом.
+
+    Полные тексты встречаются не реже раза в SNAPSHOT_EVERY версий,
+    поэтому достаточно прочитать окно перед first.
+    """
+    revisions = PostRevision.objects.filter(
+        post_id=post_id,
+        number__gt=first - SNAPSHOT_EVERY,
+        number__lte=last,
+    ).values_list('number', 'is_snapshot', 'data').order_by('number')
+
+    texts = {}
+    text = None
+    for number, is_snapshot, data in revisions:
+        if is_snapshot:
+            text = data
+        elif text is not None:
+            text = apply_delta(text, json.loads(data))
+        if number >= first and text is not None:
+            texts[number] = text
+    return texts
+
+
+def revision_diff(old, new):
+    """Строки унифицированного diff без заголовков файлов."""
+    lines = unified_diff(
+        old.splitlines(), new.splitlines(), lineterm='', n=2
+    )
+    return list(islice(lines, 2, None))
+
+
+def prune_revisions(keep=REVISIONS_KEPT):
+    """Оставляет каждому посту keep последних версий.
+
+    Самая старая из оставшихся становится полным текстом, иначе
+    следующие за ней разницы не к чему применить. Возвращает число
+    удалённых версий.
+    """
+    if keep < 1:
+        raise ValueError('Нужно оставить хотя бы одну версию')
+    posts = PostRevision.objects.values('post_id').annotate(
+        last=Max('number'), count=Count('pk')
+    ).filter(count__gt=keep).values_list('post_id', 'last').order_by()
+
+    deleted = 0
+    for post_id, last in posts:
+        first = last - keep + 1
+        oldest = PostRevision.objects.get(post_id=post_id, number=first)
+        with transaction.atomic():
+            if not oldest.is_snapshot:
+                oldest.data = revision_texts(post_id, first, first)[first]
+                oldest.is_snapshot = True
+                oldest.save(update_fields=['data', 'is_snapshot'])
+            deleted += PostRevision.objects.filter(
+                post_id=post_id, number__lt=first
+            ).delete()[0]
+    return deleted
@@ -0,0 +1,31 @@
+from django.conf import settings
+
+ARCHIVE_MODELS = ('archivedpost', 'archivedcomment')
+
+
+class ArchiveRouter:
+    """Держит архив постов в отдельной БД, если задан ARCHIVE_DATABASE."""
+
+    def _db(self, model):
+        if (
+            settings.ARCHIVE_DATABASE
+            and model._meta.app_label == 'posts'
+            and model._meta.model_name in ARCHIVE_MODELS
+        ):
+            return settings.ARCHIVE_DATABASE
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._db(model)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not settings.ARCHIVE_DATABASE:
+            return None
+        if app_label == 'posts' and model_name in ARCHIVE_MODELS:
+            return db == settings.ARCHIVE_DATABASE
+        if db == settings.ARCHIVE_DATABASE:
+            return False
+        return None
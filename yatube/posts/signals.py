@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .counters import forget_author_post_count
+from .following import forget_following
+from .group_stats import mark_group_dirty
+from .models import Comment, Follow, Post
+from .ranking import mark_author_dirty, mark_post_dirty
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    mark_group_dirty(instance.group_id)
+    update_fields = kwargs.get('update_fields') or ()
+    if kwargs.get('created', True) or 'deleted' in update_fields:
+        forget_author_post_count(instance.author_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    mark_post_dirty(instance.post_id)
+
+
+# Пользователь подписался или отписался через сайт. Подписка из
+# представления вставляется bulk_create, без post_save, поэтому о ней
+# сообщает только этот сигнал.
+follow_toggled = Signal(providing_args=['user_id', 'author_id', 'following'])
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def follow_saved(sender, instance, **kwargs):
+    mark_author_dirty(instance.author_id)
+    forget_following(instance.user_id)
+
+
+@receiver(follow_toggled)
+def follow_changed(sender, user_id, author_id, following, **kwargs):
+    # Отписка, удаление в админке и каскад от пользователя проходят
+    # через post_delete.
+    if following:
+        mark_author_dirty(author_id)
+        forget_following(user_id)
@@ -0,0 +1,116 @@
+from django.db import transaction
+
+from .markup import extract_tags, extract_usernames
+from .models import Comment, Mention, Post, Tag, TaggedPost, User
+
+BATCH_SIZE = 200
+
+
+def tag_ids(names):
+    """Словарь имя -> pk тега; недостающие теги создаются."""
+    if not names:
+        return {}
+    ids = dict(
+        Tag.objects.filter(name__in=names).values_list('name', 'pk')
+    )
+    missing = set(names) - ids.keys()
+    if missing:
+        Tag.objects.bulk_create(
+            (Tag(name=name) for name in missing), ignore_conflicts=True
+        )
+        ids.update(
+            Tag.objects.filter(name__in=missing).values_list('name', 'pk')
+        )
+    return ids
+
+
+def user_ids(usernames):
+    if not usernames:
+        return {}
+    return dict(
+        User.objects.filter(username__in=usernames).values_list(
+            'username', 'pk'
+        )
+    )
+
+
+def _mentioned(objects):
+    """Пары (запись, pk упомянутого); себя автор не упоминает."""
+    names = {obj.pk: extract_usernames(obj.text) for obj in objects}
+    ids = user_ids(set().union(*names.values()))
+    for obj in objects:
+        for name in names[obj.pk]:
+            if name in ids and ids[name] != obj.author_id:
+                yield obj, ids[name]
+
+
+@transaction.atomic
+def index_posts(posts):
+    """Переписывает хештеги и упоминания постов.
+
+    На пачку уходит по запросу за тегами и пользователями, удаление
+    старых связей и две массовые вставки, сколько бы постов ни было.
+    """
+    posts = list(posts)
+    if not posts:
+        return
+    names = {post.pk: extract_tags(post.text) for post in posts}
+    ids = tag_ids(set().union(*names.values()))
+
+    TaggedPost.objects.filter(post__in=posts).delete()
+    TaggedPost.objects.bulk_create(
+        TaggedPost(post_id=pk, tag_id=ids[name])
+        for pk, post_names in names.items()
+        for name in post_names
+    )
+    Mention.objects.filter(post__in=posts, comment=None).delete()
+    Mention.objects.bulk_create(
+        Mention(user_id=user_id, post_id=post.pk)
+        for post, user_id in _mentioned(posts)
+    )
+
+
+@transaction.atomic
+def index_comments(comments):
+    """Переписывает упоминания комментариев."""
+    comments = list(comments)
+    if not comments:
+        return
+    Mention.objects.filter(comment__in=comments).delete()
+    Mention.objects.bulk_create(
+        Mention(
+            user_id=user_id, post_id=comment.post_id, comment_id=comment.pk
+        )
+        for comment, user_id in _mentioned(comments)
+    )
+
+
+def reindex(queryset, index, batch_size=BATCH_SIZE):
+    """Проходит все записи пачками по возрастанию pk.
+
+    Курсор по pk вместо OFFSET: каждая пачка читается по индексу,
+    а в памяти никогда не больше batch_size текстов.
+    """
+    objects = queryset.order_by('pk')
+    count = 0
+    last_pk = 0
+    while True:
+        batch = list(objects.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return count
+        index(batch)
+        count += len(batch)
+        last_pk = batch[-1].pk
+
+
+def reindex_all(batch_size=BATCH_SIZE):
+    return {
+        Post: reindex(
+            Post.objects.only('text', 'author_id'), index_posts, batch_size
+        ),
+        Comment: reindex(
+            Comment.objects.only('text', 'author_id', 'post_id'),
+            index_comments,
+            batch_size
+        ),
+    }
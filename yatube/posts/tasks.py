@@ -0,0 +1,48 @@
+from sorl.thumbnail import get_thumbnail
+from tasks.queue import task
+
+from . import archive, group_stats, ranking, recommendations, revisions
+from .models import Post
+
+# Размеры совпадают с тегами thumbnail в card.html и post_detail.html.
+THUMBNAIL_SIZES = ('500x100', '960x339')
+
+
+@task
+def make_thumbnails(post_id):
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    for size in THUMBNAIL_SIZES:
+        get_thumbnail(post.image, size, crop='center', upscale=True)
+
+
+@task(every=300)
+def recompute_scores():
+    ranking.recompute_scores()
+
+
+@task(every=60 * 60)
+def build_follow_suggestions():
+    recommendations.build_suggestions()
+
+
+@task(every=60)
+def refresh_group_stats():
+    group_stats.refresh_group_stats()
+
+
+@task(every=24 * 60 * 60)
+def refresh_all_group_stats():
+    # Пост, перенесённый в другую группу, помечает только новую.
+    group_stats.refresh_group_stats(full=True)
+
+
+@task(every=24 * 60 * 60)
+def archive_posts():
+    archive.run_archival()
+
+
+@task(every=24 * 60 * 60)
+def prune_revisions():
+    revisions.prune_revisions()
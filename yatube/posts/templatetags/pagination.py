@@ -0,0 +1,10 @@
+from django import template
+
+from ..utills import page_window as get_page_window
+
+register = template.Library()
+
+
+@register.filter
+def page_window(page_obj):
+    return get_page_window(page_obj)
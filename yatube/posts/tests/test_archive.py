@@ -0,0 +1,130 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from posts.archive import archive_posts, purge_deleted
+from posts.models import ArchivedComment, ArchivedPost, Comment, Post, User
+
+
+class ArchiveTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='dev')
+        cls.reader = User.objects.create_user(username='arm')
+        cls.old_post = Post.objects.create(
+            text='старый **пост**', author=cls.author
+        )
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        Comment.objects.create(
+            text='комментарий', post=cls.old_post, author=cls.reader
+        )
+        cls.new_post = Post.objects.create(text='новый', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_soft_delete_hides_post_and_keeps_comments(self):
+        Comment.objects.create(
+            text='комментарий', post=self.new_post, author=self.reader
+        )
+        self.client.force_login(self.author)
+
+        response = self.client.post(
+            reverse('posts:post_delete', args=(self.new_post.pk,))
+        )
+
+        self.assertRedirects(response, reverse('posts:profile', args=('dev',)))
+        self.assertFalse(Post.objects.filter(pk=self.new_post.pk).exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.new_post.pk).exists())
+        self.assertTrue(Comment.objects.filter(post=self.new_post).exists())
+        self.assertEqual(
+            self.client.get(
+                reverse('posts:post_detail', args=(self.new_post.pk,))
+            ).status_code,
+            404
+        )
+
+    def test_only_author_deletes(self):
+        self.client.force_login(self.reader)
+
+        self.client.post(
+            reverse('posts:post_delete', args=(self.new_post.pk,))
+        )
+
+        self.assertTrue(Post.objects.filter(pk=self.new_post.pk).exists())
+
+    def test_purge_deleted(self):
+        self.new_post.soft_delete()
+
+        self.assertEqual(purge_deleted(timezone.now() - timedelta(days=1)), 0)
+        self.assertEqual(purge_deleted(timezone.now()), 1)
+        self.assertFalse(Post.all_objects.filter(pk=self.new_post.pk).exists())
+
+    def test_comment_added_during_archival_kept(self):
+        bulk_create = ArchivedComment.objects.bulk_create
+        added = []
+
+        def copy_then_comment(objs, **kwargs):
+            result = bulk_create(objs, **kwargs)
+            if not added:
+                added.append(Comment.objects.create(
+                    text='поздний', post=self.old_post, author=self.reader
+                ))
+            return result
+
+        with patch.object(
+            ArchivedComment.objects, 'bulk_create',
+            side_effect=copy_then_comment
+        ):
+            archive_posts(timezone.now() - timedelta(days=365))
+
+        self.assertFalse(Comment.objects.filter(pk=added[0].pk).exists())
+        self.assertTrue(
+            ArchivedComment.objects.filter(pk=added[0].pk).exists()
+        )
+
+    def test_old_posts_moved_to_archive(self):
+        archived = archive_posts(timezone.now() - timedelta(days=365))
+
+        self.assertEqual(archived, 1)
+        self.assertEqual(list(Post.objects.all()), [self.new_post])
+        post = ArchivedPost.objects.get()
+        self.assertEqual(post.pk, self.old_post.pk)
+        self.assertEqual(post.text_html, self.old_post.text_html)
+        self.assertLess(post.pub_date, timezone.now() - timedelta(days=365))
+        self.assertEqual(ArchivedComment.objects.get().post, post)
+
+    def test_post_detail_falls_back_to_archive(self):
+        archive_posts(timezone.now() - timedelta(days=365))
+        self.client.force_login(self.reader)
+        url = reverse('posts:post_detail', args=(self.old_post.pk,))
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['archived'])
+        self.assertEqual(response.context['post'].author, self.author)
+        self.assertContains(response, '<strong>пост</strong>')
+        self.assertContains(response, 'комментарий')
+        self.assertNotContains(response, 'Добавить комментарий')
+
+    def test_command(self):
+        self.new_post.soft_delete()
+        Post.all_objects.filter(pk=self.new_post.pk).update(
+            deleted=timezone.now() - timedelta(days=60)
+        )
+        out = StringIO()
+
+        call_command('archive_posts', days=365, stdout=out)
+
+        self.assertIn('Archived: 1', out.getvalue())
+        self.assertIn('Purged: 1', out.getvalue())
+        self.assertFalse(Post.all_objects.exists())
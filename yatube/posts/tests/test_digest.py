@@ -0,0 +1,77 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from posts.digest import POSTS_PER_DIGEST, build_digests
+from posts.models import Follow, Post, User
+
+
+class DigestTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.quiet = User.objects.create_user(username='quiet')
+        cls.readers = [
+            User.objects.create_user(
+                username=f'reader{i}', email=f'reader{i}@example.com'
+            )
+            for i in range(3)
+        ]
+        User.objects.create_user(username='lonely', email='l@example.com')
+        Follow.objects.bulk_create(
+            Follow(user=reader, author=cls.author) for reader in cls.readers
+        )
+        Follow.objects.create(user=cls.readers[0], author=cls.quiet)
+
+        cls.old_post = Post.objects.create(text='старый', author=cls.author)
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=2)
+        )
+        cls.new_post = Post.objects.create(text='новый', author=cls.author)
+
+    def test_digest_contains_only_new_followed_posts(self):
+        out = StringIO()
+
+        call_command('send_digest', stdout=out)
+
+        self.assertIn('Digests: 3', out.getvalue())
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            [reader.email for reader in self.readers]
+        )
+        body = mail.outbox[0].body
+        self.assertIn('author: новый', body)
+        self.assertIn(f'/posts/{self.new_post.pk}/', body)
+        self.assertNotIn('старый', body)
+
+    def test_queries_per_chunk_not_per_user(self):
+        since = timezone.now() - timedelta(days=1)
+
+        # По пачке из двух пользователей: пользователи, подписки, посты;
+        # последняя пачка пустая.
+        with self.assertNumQueries(7):
+            digests = list(build_digests(since, chunk_size=2))
+
+        self.assertEqual([len(chunk) for chunk in digests], [2, 1])
+
+    def test_long_digest_truncated(self):
+        Post.objects.bulk_create(
+            Post(text=f'пост {i}', preview=f'пост {i}', author=self.quiet)
+            for i in range(POSTS_PER_DIGEST + 2)
+        )
+        since = timezone.now() - timedelta(days=1)
+
+        messages = [
+            message
+            for chunk in build_digests(since)
+            for message in chunk
+            if message[3] == [self.readers[0].email]
+        ]
+
+        subject, body, _, _ = messages[0]
+        self.assertIn(str(POSTS_PER_DIGEST + 3), subject)
+        self.assertIn('И ещё 3: http://127.0.0.1:8000/follow/', body)
@@ -0,0 +1,111 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from posts.following import following_ids
+from posts.identity import users_by_username
+from posts.models import Follow, Post, PostScore, User
+
+
+# Как с общим кешем: пользователь и сессия читаются из кеша.
+@override_settings(
+    USER_CACHE_TIME=300,
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db'
+)
+class FollowTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dev')
+        cls.author = User.objects.create_user(username='arm')
+        cls.follow_url = reverse('posts:profile_follow', args=('arm',))
+        cls.unfollow_url = reverse('posts:profile_unfollow', args=('arm',))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.client.get(reverse('about:tech'))
+        users_by_username.get('arm')
+
+    def test_follow_is_idempotent_upsert(self):
+        # Проверка, вставка, пометка рейтинга, задача уведомления и
+        # отметка о чтении из default в сессии (UPDATE в savepoint).
+        with self.assertNumQueries(7):
+            response = self.client.post(self.follow_url)
+        with patch('posts.views.follow_toggled.send') as send:
+            with self.assertNumQueries(1):
+                self.client.post(self.follow_url)
+        send.assert_not_called()
+
+        self.assertRedirects(
+            response, reverse('posts:profile', args=('arm',))
+        )
+        self.assertEqual(
+            Follow.objects.filter(user=self.user, author=self.author).count(),
+            1
+        )
+
+    def test_unfollow_goes_through_post_delete(self):
+        Follow.objects.create(user=self.user, author=self.author)
+
+        # Выборка для post_delete, удаление, пометка рейтинга и сессия.
+        with self.assertNumQueries(6):
+            self.client.post(self.unfollow_url)
+        self.assertFalse(Follow.objects.exists())
+
+        with self.assertNumQueries(1):
+            self.client.post(self.unfollow_url)
+
+    def test_get_not_allowed(self):
+        self.assertEqual(self.client.get(self.follow_url).status_code, 405)
+        self.assertEqual(self.client.get(self.unfollow_url).status_code, 405)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_deleting_follower_marks_ranking_dirty(self):
+        post = Post.objects.create(text='Пост', author=self.author)
+        PostScore.objects.create(post=post, score=1)
+        follower = User.objects.create_user(username='follower')
+        Follow.objects.create(user=follower, author=self.author)
+        PostScore.objects.update(dirty=False)
+
+        follower.delete()
+        self.assertTrue(PostScore.objects.get().dirty)
+
+    def test_ajax_gets_button_fragment(self):
+        response = self.client.post(
+            self.follow_url, HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertTemplateUsed(response, 'includes/follow_button.html')
+        self.assertContains(response, self.unfollow_url)
+
+    def test_cannot_follow_self(self):
+        self.client.post(reverse('posts:profile_follow', args=('dev',)))
+        self.assertFalse(Follow.objects.exists())
+
+    def test_profile_shows_viewer_follow_state(self):
+        other = User.objects.create_user(username='other')
+        Follow.objects.create(user=other, author=self.author)
+        profile_url = reverse('posts:profile', args=('arm',))
+
+        self.assertFalse(self.client.get(profile_url).context['following'])
+        self.client.post(self.follow_url)
+        self.assertTrue(self.client.get(profile_url).context['following'])
+
+    def test_following_ids_cached_until_toggle(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(following_ids(self.user), frozenset())
+        with self.assertNumQueries(0):
+            following_ids(self.user)
+
+        self.client.post(self.follow_url)
+        self.assertEqual(following_ids(self.user), {self.author.pk})
+
+    @override_settings(CARD_FOLLOW_BUTTONS=True)
+    def test_card_follow_buttons(self):
+        Post.objects.create(text='Пост', author=self.author)
+        self.client.post(self.follow_url)
+
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, self.unfollow_url)
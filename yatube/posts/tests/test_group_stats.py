@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from posts.group_stats import refresh_group_stats
+from posts.models import Group, GroupStats, Post, User
+
+
+class GroupStatsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_dev = User.objects.create_user(username='dev')
+        cls.user_arm = User.objects.create_user(username='arm')
+        cls.busy = Group.objects.create(
+            title='Busy', slug='busy', description='Описание'
+        )
+        cls.empty = Group.objects.create(
+            title='Empty', slug='empty', description='Описание'
+        )
+        for author in (cls.user_dev, cls.user_dev, cls.user_arm):
+            Post.objects.create(text='Пост', author=author, group=cls.busy)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stats_from_single_aggregate_query(self):
+        with self.assertNumQueries(6):
+            self.assertEqual(refresh_group_stats(), 2)
+
+        stats = GroupStats.objects.get(group=self.busy)
+        self.assertEqual(stats.post_count, 3)
+        self.assertEqual(
+            stats.last_post, Post.objects.latest('pub_date').pub_date
+        )
+        self.assertEqual(stats.top_author_names, ['dev', 'arm'])
+        self.assertEqual(
+            GroupStats.objects.get(group=self.empty).post_count, 0
+        )
+
+    def test_only_changed_groups_refreshed(self):
+        refresh_group_stats()
+        self.assertEqual(refresh_group_stats(), 0)
+
+        Post.objects.create(
+            text='Пост', author=self.user_arm, group=self.empty
+        )
+        self.assertEqual(refresh_group_stats(), 1)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.empty).post_count, 1
+        )
+
+    def test_directory_ordered_by_activity(self):
+        refresh_group_stats()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('posts:groups'))
+
+        self.assertEqual(
+            list(response.context['page_obj']), [self.busy, self.empty]
+        )
+        self.assertContains(response, 'Постов: 3')
@@ -0,0 +1,110 @@
+from django.core.cache import cache
+from core.routers import reading_from_replica
+from django.http import Http404
+from django.test import TestCase, override_settings
+from posts.identity import groups_by_slug, users_by_username
+from posts.models import Group, User
+
+
+class IdentityCacheTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        groups_by_slug.local.clear()
+
+    def test_lookup_served_from_memory_then_cache(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(groups_by_slug.get('group'), self.group)
+        with self.assertNumQueries(0):
+            groups_by_slug.get('group')
+
+        groups_by_slug.local.clear()
+        with self.assertNumQueries(0):
+            groups_by_slug.get('group')
+
+    def test_rename_invalidates_old_and_new_values(self):
+        groups_by_slug.get('group')
+        self.group.slug = 'renamed'
+        self.group.title = 'Новое название'
+        self.group.save()
+
+        with self.assertRaises(Http404):
+            groups_by_slug.get_or_404('group')
+        self.assertEqual(
+            groups_by_slug.get('renamed').title, 'Новое название'
+        )
+
+    def test_rename_of_loaded_object_needs_no_select(self):
+        group = Group.objects.get(pk=self.group.pk)
+        groups_by_slug.get('group')
+        group.slug = 'renamed'
+
+        with self.assertNumQueries(1):
+            group.save()
+        self.assertNotIn('group', groups_by_slug.local)
+
+        group.title = 'Другое название'
+        group.save(update_fields=['title'])
+        group.slug = 'again'
+        group.save()
+        with self.assertRaises(Http404):
+            groups_by_slug.get_or_404('renamed')
+
+    def test_partial_save_keeps_old_value_for_next_rename(self):
+        groups_by_slug.get('group')
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed'
+        group.save(update_fields=['title'])
+        group.save()
+
+        with self.assertRaises(Http404):
+            groups_by_slug.get_or_404('group')
+
+    def test_constructed_object_rename_checks_database(self):
+        groups_by_slug.get('group')
+        group = Group(
+            pk=self.group.pk, title='Группа', slug='renamed',
+            description='Описание'
+        )
+
+        with self.assertNumQueries(2):
+            group.save()
+        with self.assertRaises(Http404):
+            groups_by_slug.get_or_404('group')
+
+    @override_settings(REPLICA_DATABASE='replica')
+    def test_miss_read_from_primary(self):
+        with reading_from_replica(True):
+            self.assertEqual(groups_by_slug.get('group'), self.group)
+
+    def test_group_page_skips_group_query(self):
+        self.client.get('/group/group/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/group/group/')
+        self.assertEqual(response.context['group'], self.group)
+
+    def test_user_cached_without_password_and_email(self):
+        User.objects.create_user(
+            username='dev', password='pass', email='dev@example.com',
+            first_name='Дев'
+        )
+        users_by_username.get('dev')
+
+        cached = cache.get(users_by_username.key('dev'))
+        self.assertEqual(cached.first_name, 'Дев')
+        self.assertNotIn('password', vars(cached))
+        self.assertNotIn('email', vars(cached))
+
+    def test_last_login_update_keeps_user_cached(self):
+        user = User.objects.create_user(username='dev', password='pass')
+        users_by_username.get('dev')
+
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+        self.assertIn('dev', users_by_username.local)
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from posts.markup import RENDER_VERSION, render_markup
+from posts.models import Comment, Post, User
+
+
+class MarkupTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dev')
+
+    def test_text_is_escaped_before_formatting(self):
+        self.assertEqual(
+            render_markup('<script>x</script> **жирный** *курсив* `a<b`'),
+            '<p>&lt;script&gt;x&lt;/script&gt; <strong>жирный</strong> '
+            '<em>курсив</em> <code>a&lt;b</code></p>'
+        )
+        self.assertEqual(
+            render_markup('строка\nещё\n\nабзац'),
+            '<p>строка<br>ещё</p><p>абзац</p>'
+        )
+
+    def test_links_and_known_mentions(self):
+        html = render_markup(
+            'см. https://example.com/a_b_c. @dev и @ghost, mail@dev.ru',
+            {'dev'}
+        )
+
+        self.assertIn(
+            '<a href="https://example.com/a_b_c" rel="nofollow noopener">',
+            html
+        )
+        self.assertIn('<a href="/profile/dev/">@dev</a>', html)
+        self.assertIn(' @ghost,', html)
+        self.assertIn('mail@dev.ru', html)
+
+    def test_html_rendered_on_save(self):
+        post = Post.objects.create(text='Привет, @dev!', author=self.user)
+        comment = Comment.objects.create(
+            text='**да**', post=post, author=self.user
+        )
+
+        self.assertIn('href="/profile/dev/"', post.text_html)
+        self.assertEqual(comment.text_html, '<p><strong>да</strong></p>')
+        self.assertEqual(post.render_version, RENDER_VERSION)
+
+    def test_command_rerenders_stale_rows_only(self):
+        post = Post.objects.create(text='*текст*', author=self.user)
+        Post.objects.filter(pk=post.pk).update(
+            text_html='', render_version=0
+        )
+
+        call_command('rerender_markup', stdout=StringIO())
+
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p><em>текст</em></p>')
+        with self.assertNumQueries(2):
+            call_command('rerender_markup', stdout=StringIO())
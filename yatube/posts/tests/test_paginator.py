@@ -0,0 +1,58 @@
+from django.core.paginator import Paginator
+from django.test import TestCase
+from posts.models import Post, User
+from posts.utills import NoCountPaginator, page_window
+
+
+class PaginatorTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='dev')
+        Post.objects.bulk_create(
+            Post(text=f'post {i}', author=user) for i in range(25)
+        )
+
+    def test_window_elides_distant_pages(self):
+        page_obj = Paginator(range(1000), 10).page(50)
+
+        self.assertEqual(
+            page_window(page_obj), [1, None, 48, 49, 50, 51, 52, None, 100]
+        )
+        self.assertEqual(
+            page_window(Paginator(range(30), 10).page(1)), [1, 2, 3]
+        )
+
+    def test_no_count_paginator_skips_count_query(self):
+        paginator = NoCountPaginator(Post.objects.all(), 10)
+
+        with self.assertNumQueries(1):
+            page_obj = paginator.get_page(2)
+            self.assertEqual(len(page_obj), 10)
+            self.assertTrue(page_obj.has_next())
+            self.assertEqual(page_window(page_obj), [1, 2, 3])
+
+        last_page = NoCountPaginator(Post.objects.all(), 10).get_page(3)
+        self.assertEqual(len(last_page), 5)
+        self.assertFalse(last_page.has_next())
+
+    def test_no_count_paginator_out_of_range_gives_last_page(self):
+        # Пустая страница, COUNT(*) и последняя страница.
+        with self.assertNumQueries(3):
+            NoCountPaginator(Post.objects.all(), 10).get_page(9)
+
+        for number in (9, 0, -1):
+            with self.subTest(number=number):
+                page_obj = NoCountPaginator(
+                    Post.objects.all(), 10
+                ).get_page(number)
+                self.assertEqual(page_obj.number, 3)
+                self.assertEqual(len(page_obj), 5)
+                self.assertFalse(page_obj.has_next())
+
+        self.assertEqual(
+            NoCountPaginator(Post.objects.all(), 10).get_page('x').number, 1
+        )
+        self.assertEqual(
+            NoCountPaginator(Post.objects.none(), 10).get_page(5).number, 1
+        )
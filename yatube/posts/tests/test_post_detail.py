@@ -0,0 +1,132 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from posts.counters import AUTHOR_POST_COUNT_KEY, author_post_count
+from posts.models import Comment, Group, Post, User
+from posts.utills import NoCountPaginator
+from yatube.settings import STREAM_COMMENTS_THRESHOLD
+
+
+class PostDetailTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dev')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            text='Пост', author=cls.user, group=cls.group
+        )
+        cls.url = reverse('posts:post_detail', args=(cls.post.pk,))
+
+    def setUp(self):
+        cache.clear()
+
+    def add_comments(self, count):
+        Comment.objects.bulk_create(
+            Comment(text=f'comment-{i}', post=self.post, author=self.user)
+            for i in range(count)
+        )
+
+    def test_short_page_rendered_at_once(self):
+        self.add_comments(2)
+        response = self.client.get(self.url)
+
+        self.assertFalse(response.streaming)
+        self.assertContains(response, 'comment-1')
+
+    def test_long_page_streamed(self):
+        self.add_comments(STREAM_COMMENTS_THRESHOLD + 1)
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn(self.post.text, content)
+        self.assertEqual(
+            content.count('comment-'), STREAM_COMMENTS_THRESHOLD + 1
+        )
+        self.assertNotIn('<!--comments-->', content)
+        self.assertIn('</footer>', content)
+
+    def test_long_page_reads_rest_of_comments_while_streaming(self):
+        self.add_comments(STREAM_COMMENTS_THRESHOLD + 30)
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            content = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(
+            content.count('comment-'), STREAM_COMMENTS_THRESHOLD + 30
+        )
+        last = STREAM_COMMENTS_THRESHOLD + 29
+        self.assertLess(
+            content.index('comment-0<'), content.index(f'comment-{last}<')
+        )
+
+    def test_query_count_independent_of_comments(self):
+        self.client.get(self.url)
+        for count in (1, 30):
+            self.add_comments(count)
+            with self.subTest(comments=count), self.assertNumQueries(2):
+                response = self.client.get(self.url)
+            self.assertEqual(response.context['count_posts'], 1)
+
+    def test_author_post_count_follows_new_posts(self):
+        self.client.get(self.url)
+        Post.objects.create(text='Ещё пост', author=self.user)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['count_posts'], 2)
+
+    def test_replica_count_cached_briefly(self):
+        key = AUTHOR_POST_COUNT_KEY.format(self.user.pk)
+        with patch('posts.counters.cache') as counter_cache:
+            counter_cache.get.return_value = None
+            with patch('posts.counters.use_replica', return_value=True):
+                author_post_count(self.user.pk)
+        counter_cache.add.assert_called_once_with(
+            key, 1, settings.REPLICA_STICKY_TIME
+        )
+
+    def test_profile_skips_page_count(self):
+        profile_url = reverse('posts:profile', args=(self.user.username,))
+        self.client.get(profile_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(profile_url)
+
+        self.assertEqual(response.context['count_posts'], 1)
+        self.assertContains(response, self.post.text)
+
+    def test_profile_paginator_uses_post_counter(self):
+        Post.objects.bulk_create(
+            Post(text=f'пост {i}', author=self.user) for i in range(24)
+        )
+        profile_url = reverse('posts:profile', args=(self.user.username,))
+        self.client.get(profile_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(profile_url)
+
+        paginator = response.context['page_obj'].paginator
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertContains(response, 'Последняя')
+
+        with patch('posts.utills.PAGINATOR_SKIP_COUNT', True):
+            response = self.client.get(profile_url)
+        self.assertEqual(
+            type(response.context['page_obj'].paginator), NoCountPaginator
+        )
+
+    def test_post_without_group(self):
+        post = Post.objects.create(text='Без группы', author=self.user)
+        response = self.client.get(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Все записи группы')
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.identity import groups_by_slug
+from posts.models import PREVIEW_LENGTH, Group, Post, User
+
+
+class PreviewTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dev')
+        cls.long_post = Post.objects.create(
+            text='слово ' * 200, author=cls.user
+        )
+        cls.short_post = Post.objects.create(text='Коротко', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_preview_stored_on_save(self):
+        self.assertEqual(len(self.long_post.preview), PREVIEW_LENGTH)
+        self.assertTrue(self.long_post.is_truncated)
+        self.assertEqual(self.short_post.preview, 'Коротко')
+        self.assertFalse(self.short_post.is_truncated)
+
+        self.short_post.text = 'Новый текст'
+        self.short_post.save(update_fields=['text'])
+        self.short_post.refresh_from_db()
+        self.assertEqual(self.short_post.preview, 'Новый текст')
+
+    def test_feed_reads_only_card_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:index'))
+
+        feed_sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"posts_post"."preview"', feed_sql)
+        self.assertNotIn('"posts_post"."text"', feed_sql)
+        self.assertNotIn('"auth_user"."password"', feed_sql)
+        self.assertContains(
+            response, reverse('posts:post_detail', args=(self.long_post.pk,))
+        )
+        self.assertContains(response, 'Читать дальше', count=1)
+
+    def test_bulk_create_fills_preview(self):
+        post, = Post.objects.bulk_create(
+            [Post(text='Пачкой', author=self.user)]
+        )
+
+        self.assertEqual(post.preview, 'Пачкой')
+
+    def test_group_page_query_count(self):
+        group = Group.objects.create(title='Группа', slug='group')
+        Post.objects.bulk_create(
+            Post(text=f'пост {i}', author=self.user, group=group)
+            for i in range(10)
+        )
+        self.client.get(reverse('about:tech'))
+        groups_by_slug.get('group')
+
+        # Текст и полное имя автора входят в выборку ленты группы:
+        # один запрос за постами, один - за COUNT(*).
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('posts:group_list', args=('group',))
+            )
+        self.assertContains(response, 'пост 9')
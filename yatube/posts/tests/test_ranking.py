@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from posts.models import Comment, Follow, Post, PostScore, User
+from posts.ranking import compute_score, recompute_scores
+
+
+class RankingTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_dev = User.objects.create_user(username='dev')
+        cls.user_arm = User.objects.create_user(username='arm')
+
+        cls.old_post = Post.objects.create(text='old', author=cls.user_dev)
+        cls.new_post = Post.objects.create(text='new', author=cls.user_arm)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_score_decays_with_age(self):
+        now = timezone.now()
+        self.assertGreater(
+            compute_score(now, 0, 0),
+            compute_score(now - timedelta(days=1), 5, 0)
+        )
+        self.assertGreater(
+            compute_score(now, 1, 0),
+            compute_score(now, 0, 0)
+        )
+
+    def test_only_new_and_dirty_posts_recomputed(self):
+        self.assertEqual(recompute_scores(), 2)
+        self.assertEqual(recompute_scores(), 0)
+
+        Comment.objects.create(
+            text='comment', post=self.old_post, author=self.user_arm
+        )
+        self.assertTrue(PostScore.objects.get(post=self.old_post).dirty)
+        self.assertEqual(recompute_scores(), 1)
+
+        Follow.objects.create(user=self.user_dev, author=self.user_arm)
+        self.assertEqual(recompute_scores(), 1)
+        self.assertFalse(PostScore.objects.filter(dirty=True).exists())
+
+    def test_popular_page_ordered_by_score(self):
+        recompute_scores()
+        PostScore.objects.filter(post=self.old_post).update(score=10 ** 6)
+
+        response = self.client.get(reverse('posts:popular'))
+
+        self.assertTemplateUsed(response, 'posts/popular.html')
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.old_post, self.new_post]
+        )
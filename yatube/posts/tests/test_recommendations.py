@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from posts.models import Follow, FollowSuggestion, User
+from posts.recommendations import build_suggestions
+
+
+class RecommendationsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            name: User.objects.create_user(username=name)
+            for name in ('ann', 'bob', 'cat', 'dan', 'eve')
+        }
+        edges = (
+            ('ann', 'bob'),
+            ('bob', 'cat'),
+            ('dan', 'bob'),
+            ('dan', 'eve'),
+        )
+        Follow.objects.bulk_create(
+            Follow(user=cls.users[user], author=cls.users[author])
+            for user, author in edges
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def suggested(self, name):
+        return list(
+            FollowSuggestion.objects.filter(
+                user=self.users[name]
+            ).values_list('author__username', flat=True)
+        )
+
+    def test_friends_of_friends_and_co_follows(self):
+        build_suggestions()
+
+        self.assertEqual(self.suggested('ann'), ['eve', 'cat'])
+        self.assertNotIn('bob', self.suggested('dan'))
+        self.assertNotIn('dan', self.suggested('dan'))
+
+    def test_graph_computed_before_write_transaction(self):
+        atomic_depth = []
+
+        def suggest(*args):
+            atomic_depth.append(len(connection.savepoint_ids))
+            return []
+
+        with patch('posts.recommendations.suggest', suggest):
+            build_suggestions()
+
+        # Расчёт идёт вне транзакции build_suggestions: глубже
+        # транзакции теста savepoint-ов нет.
+        self.assertTrue(atomic_depth)
+        self.assertEqual(set(atomic_depth), {len(connection.savepoint_ids)})
+
+    def test_rebuild_replaces_table(self):
+        build_suggestions()
+        Follow.objects.create(user=self.users['ann'], author=self.users['eve'])
+        build_suggestions()
+
+        self.assertEqual(self.suggested('ann'), ['cat'])
+
+    def test_suggestions_served_on_follow_index(self):
+        build_suggestions()
+        self.client.force_login(self.users['ann'])
+
+        response = self.client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(
+            [item.author for item in response.context['suggestions']],
+            [self.users['eve'], self.users['cat']]
+        )
@@ -0,0 +1,160 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.urls import reverse
+from posts.models import Post, PostRevision, User
+from posts.revisions import (SNAPSHOT_EVERY, apply_delta, make_delta,
+                             prune_revisions, record_revision,
+                             revision_texts, save_with_revision)
+
+
+class RevisionsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dev')
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            text='первая строка\nвторая\nтретья', author=self.user
+        )
+
+    def edit(self, text):
+        old_text = self.post.text
+        self.post.text = text
+        self.post.save()
+        record_revision(self.post, old_text)
+
+    def test_delta_round_trip(self):
+        old = 'a\nb\nc\nd'
+        new = 'a\nB\nc\nd\ne\n'
+
+        delta = make_delta(old, new)
+
+        self.assertEqual(delta, [[1, 2, ['B\n']], [3, 4, ['d\n', 'e\n']]])
+        self.assertEqual(apply_delta(old, delta), new)
+
+    def test_edit_view_records_revisions(self):
+        self.client.force_login(self.user)
+        url = reverse('posts:post_edit', args=(self.post.pk,))
+
+        self.client.post(url, {'text': self.post.text})
+        self.assertFalse(PostRevision.objects.exists())
+
+        self.client.post(url, {'text': 'первая строка\nвторая!\nтретья'})
+
+        self.assertEqual(
+            list(self.post.revisions.values_list('number', 'is_snapshot')),
+            [(1, True), (2, False)]
+        )
+        self.assertEqual(
+            revision_texts(self.post.pk, 1, 2),
+            {
+                1: 'первая строка\nвторая\nтретья',
+                2: 'первая строка\nвторая!\nтретья',
+            }
+        )
+
+    def test_out_of_band_edit_keeps_chain_consistent(self):
+        self.edit('one\ntwo\nthree')
+        # Правка мимо post_edit: версия не записана.
+        Post.objects.filter(pk=self.post.pk).update(
+            text='zero\none\nTWO\nthree'
+        )
+        self.post.refresh_from_db()
+
+        self.edit('zero\none\nTWO\nthree\nfour')
+
+        last = self.post.revisions.last()
+        self.assertEqual(
+            revision_texts(self.post.pk, last.number, last.number),
+            {last.number: 'zero\none\nTWO\nthree\nfour'}
+        )
+        self.assertTrue(
+            self.post.revisions.get(number=last.number - 1).is_snapshot
+        )
+
+    def test_edit_not_saved_without_revision(self):
+        def save():
+            self.post.text = 'новый текст'
+            self.post.save()
+            return self.post
+
+        with patch.object(
+            PostRevision.objects, 'bulk_create', side_effect=IntegrityError
+        ):
+            with self.assertRaises(IntegrityError):
+                save_with_revision(self.post, save)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'первая строка\nвторая\nтретья')
+
+    def test_snapshots_bound_reconstruction(self):
+        texts = {1: self.post.text}
+        for number in range(2, 2 * SNAPSHOT_EVERY + 3):
+            texts[number] = f'{self.post.text}\nправка {number}'
+            self.edit(texts[number])
+
+        self.assertEqual(
+            list(
+                self.post.revisions.filter(is_snapshot=True).values_list(
+                    'number', flat=True
+                )
+            ),
+            [1, SNAPSHOT_EVERY + 1, 2 * SNAPSHOT_EVERY + 1]
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                revision_texts(self.post.pk, 1, len(texts)), texts
+            )
+
+    def test_prune_keeps_latest_reconstructable(self):
+        texts = {}
+        for number in range(2, 8):
+            texts[number] = f'{self.post.text}\nправка {number}'
+            self.edit(texts[number])
+        out = StringIO()
+
+        call_command('prune_revisions', keep=3, stdout=out)
+
+        self.assertIn('Revisions: 4', out.getvalue())
+        self.assertEqual(
+            list(self.post.revisions.values_list('number', 'is_snapshot')),
+            [(5, True), (6, False), (7, False)]
+        )
+        self.assertEqual(
+            revision_texts(self.post.pk, 5, 7),
+            {number: texts[number] for number in (5, 6, 7)}
+        )
+
+    def test_prune_requires_keeping_a_revision(self):
+        self.edit('правка')
+
+        with self.assertRaises(CommandError):
+            call_command('prune_revisions', keep=0, stdout=StringIO())
+        with self.assertRaises(ValueError):
+            prune_revisions(keep=-1)
+        self.assertEqual(self.post.revisions.count(), 2)
+
+    def test_history_view(self):
+        self.edit('первая строка\nвторая\nтретья\nчетвёртая')
+
+        response = self.client.get(
+            reverse('posts:post_history', args=(self.post.pk,))
+        )
+
+        self.assertTemplateUsed(response, 'posts/post_history.html')
+        self.assertEqual(response.context['number'], 2)
+        self.assertIn('+четвёртая', response.context['diff'])
+        self.assertContains(response, '?revision=1')
+
+        response = self.client.get(
+            reverse('posts:post_history', args=(self.post.pk,)),
+            {'revision': 1}
+        )
+        self.assertEqual(
+            response.context['text'], 'первая строка\nвторая\nтретья'
+        )
@@ -0,0 +1,124 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from posts.markup import extract_tags, render_markup
+from posts.models import Comment, Mention, Post, Tag, TaggedPost, User
+from posts.tagging import index_posts
+
+
+class TagsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_dev = User.objects.create_user(username='dev')
+        cls.user_arm = User.objects.create_user(username='arm')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user_dev)
+
+    def test_hashtags_extracted_and_linked(self):
+        self.assertEqual(
+            extract_tags('#Django и #django, a#b, https://x.ru/#frag #x_1'),
+            {'django', 'x_1'}
+        )
+        self.assertIn(
+            '<a href="/tag/django/">#Django</a>', render_markup('#Django')
+        )
+
+    def test_post_create_and_edit_index_tags_and_mentions(self):
+        self.client.post(
+            reverse('posts:post_create'),
+            {'text': '#Django для @arm, @ghost и @dev'}
+        )
+        post = Post.objects.get()
+
+        self.assertEqual(
+            list(post.tagged.values_list('tag__name', flat=True)),
+            ['django']
+        )
+        self.assertEqual(
+            list(post.mentions.values_list('user__username', flat=True)),
+            ['arm']
+        )
+
+        self.client.post(
+            reverse('posts:post_edit', args=(post.pk,)), {'text': '#python'}
+        )
+        self.assertEqual(
+            list(post.tagged.values_list('tag__name', flat=True)),
+            ['python']
+        )
+        self.assertFalse(post.mentions.exists())
+
+    def test_comment_mentions_indexed(self):
+        post = Post.objects.create(text='#django', author=self.user_arm)
+
+        self.client.post(
+            reverse('posts:add_comment', args=(post.pk,)),
+            {'text': '@arm согласен'}
+        )
+
+        mention = Mention.objects.get()
+        self.assertEqual(mention.user, self.user_arm)
+        self.assertEqual(mention.comment, Comment.objects.get())
+        self.assertFalse(TaggedPost.objects.exists())
+
+    def test_index_batch_query_count(self):
+        posts = [
+            Post.objects.create(text=f'#tag{i} #common @arm', author=author)
+            for i, author in enumerate([self.user_dev, self.user_arm] * 5)
+        ]
+
+        # Теги, вставка недостающих и их pk, удаление и вставка связей,
+        # удаление упоминаний, пользователи, вставка упоминаний,
+        # плюс SAVEPOINT и RELEASE.
+        with self.assertNumQueries(10):
+            index_posts(posts)
+
+        self.assertEqual(Tag.objects.count(), 11)
+        self.assertEqual(TaggedPost.objects.count(), 20)
+        self.assertEqual(Mention.objects.count(), 5)
+
+    def test_backfill_command(self):
+        posts = Post.objects.bulk_create(
+            Post(text=f'#old @arm {i}', author=self.user_dev)
+            for i in range(5)
+        )
+        Comment.objects.create(
+            text='@dev', post=Post.objects.first(), author=self.user_arm
+        )
+        out = StringIO()
+
+        call_command('index_tags', batch_size=2, stdout=out)
+
+        self.assertIn('Post: 5', out.getvalue())
+        self.assertIn('Comment: 1', out.getvalue())
+        self.assertEqual(
+            TaggedPost.objects.filter(tag__name='old').count(), len(posts)
+        )
+        self.assertEqual(Mention.objects.count(), 6)
+
+    def test_tag_feed_uses_cursor(self):
+        posts = [
+            Post.objects.create(text=f'#Feed {i}', author=self.user_arm)
+            for i in range(12)
+        ]
+        Post.objects.create(text='без тегов', author=self.user_arm)
+        index_posts(Post.objects.all())
+        url = reverse('posts:tag_posts', args=('feed',))
+
+        response = self.client.get(url)
+        self.assertTemplateUsed(response, 'posts/tag.html')
+        self.assertEqual(
+            list(response.context['page_obj']), posts[:1:-1]
+        )
+        cursor = response.context['next_cursor']
+        self.assertEqual(cursor, posts[2].pk)
+
+        response = self.client.get(url, {'before': cursor})
+        self.assertEqual(list(response.context['page_obj']), posts[1::-1])
+        self.assertIsNone(response.context['next_cursor'])
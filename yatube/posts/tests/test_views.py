@@ -277,7 +277,7 @@ class ViewTestCase(TestCase):
 
         self.assertNotIn(author, author_list)
 
-        self.not_follower.get(
+        self.not_follower.post(
             reverse(
                 'posts:profile_follow',
                 kwargs={'username': ViewTestCase.user_dev.username}
@@ -288,7 +288,7 @@ class ViewTestCase(TestCase):
 
         self.assertIn(author, author_list)
 
-        self.not_follower.get(
+        self.not_follower.post(
             reverse(
                 'posts:profile_unfollow',
                 kwargs={'username': ViewTestCase.user_dev.username}
@@ -1,10 +1,72 @@
-from django.core.paginator import Paginator
+from math import ceil
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+
+from yatube.settings import PAGINATOR_SKIP_COUNT
 
 COUNT_POST = 10
+# Сколько номеров показывать по краям и вокруг текущей страницы.
+WINDOW_ON_ENDS = 1
+WINDOW_ON_EACH_SIDE = 2
+
+
+class NoCountPaginator(Paginator):
+    """Пагинатор без COUNT(*): следующая страница видна по лишней записи.
+
+    Общее число страниц неизвестно, поэтому num_pages - это номер
+    текущей страницы, плюс один, если дальше есть записи.
+    """
+
+    skip_count = True
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы не целое число')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(
+            self.object_list[bottom:bottom + self.per_page + 1]
+        )
+        if not object_list and number > 1:
+            raise EmptyPage('На странице нет записей')
+        self.num_pages = number + (len(object_list) > self.per_page)
+        return self._get_page(object_list[:self.per_page], number, self)
+
+    def get_page(self, number):
+        """Как у Paginator: нецелый номер - первая страница, номер вне
+        диапазона - последняя. COUNT(*) нужен только во втором случае.
+        """
+        try:
+            return self.page(number)
+        except PageNotAnInteger:
+            return self.page(1)
+        except EmptyPage:
+            return self.page(max(1, ceil(self.count / self.per_page)))
+
+
+class CountedPaginator(Paginator):
+    """Paginator с заранее известным числом записей, без COUNT(*)."""
 
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
 
-def get_paginator(request, queryset):
-    paginator = Paginator(queryset, COUNT_POST)
+
+def get_paginator(request, queryset, count=None):
+    """Пагинатор ленты; count - уже известное число записей, если есть."""
+    if PAGINATOR_SKIP_COUNT:
+        paginator = NoCountPaginator(queryset, COUNT_POST)
+    elif count is not None:
+        paginator = CountedPaginator(queryset, COUNT_POST, count)
+    else:
+        paginator = Paginator(queryset, COUNT_POST)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
@@ -13,3 +75,53 @@ def get_paginator(request, queryset):
         'page_number': page_number,
         'page_obj': page_obj
     }
+
+
+def get_page(request, queryset, count=None):
+    """Страница с уже загруженными записями: пригодна для gather."""
+    page_obj = get_paginator(request, queryset, count)['page_obj']
+    page_obj.object_list = list(page_obj.object_list)
+
+    return page_obj
+
+
+def get_cursor_page(request, queryset, per_page=COUNT_POST):
+    """Записи по убыванию pk после курсора ?before=<pk>.
+
+    Ни OFFSET, ни COUNT(*): страница читается по индексу с любого
+    места ленты. Возвращает записи и курсор следующей страницы
+    (None на последней).
+    """
+    queryset = queryset.order_by('-pk')
+    before = request.GET.get('before', '')
+    if before.isdigit():
+        queryset = queryset.filter(pk__lt=before)
+    object_list = list(queryset[:per_page + 1])
+    if len(object_list) > per_page:
+        return object_list[:per_page], object_list[per_page - 1].pk
+    return object_list, None
+
+
+def page_window(page_obj, on_each_side=WINDOW_ON_EACH_SIDE,
+                on_ends=WINDOW_ON_ENDS):
+    """Номера страниц для навигации: края и соседи текущей.
+
+    Пропущенные диапазоны обозначены None, поэтому список короткий
+    при любом числе страниц.
+    """
+    number = page_obj.number
+    num_pages = page_obj.paginator.num_pages
+    pages = set(range(1, min(on_ends, num_pages) + 1))
+    pages.update(
+        range(max(1, number - on_each_side),
+              min(num_pages, number + on_each_side) + 1)
+    )
+    if not getattr(page_obj.paginator, 'skip_count', False):
+        pages.update(range(max(1, num_pages - on_ends + 1), num_pages + 1))
+
+    window = []
+    for page in sorted(pages):
+        if window and page - window[-1] > 1:
+            window.append(None)
+        window.append(page)
+    return window
@@ -1,19 +1,38 @@
+from functools import partial
+from itertools import chain
+
 from django.contrib.auth.decorators import login_required
+from django.db.models import F
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.cache import cache_page
+from django.views.decorators.http import require_POST
 
-from yatube.settings import CACHE_SAVE_TIME
+from core.concurrency import gather
+from core.routers import pin_to_primary, replica_reads
+from core.streaming import render_batches, stream_template
+from notifications.tasks import notify_comment
+from yatube.settings import CACHE_SAVE_TIME, STREAM_COMMENTS_THRESHOLD
 
+from .archive import get_archived_post
+from .counters import author_post_count
+from .following import get_following_ids
 from .forms import CommentForm, PostForm
-from .models import Comment, Follow, Group, Post, User
-from .utills import get_paginator
+from .identity import groups_by_slug, users_by_username
+from .models import Comment, Follow, Group, Post
+from .recommendations import get_suggestions
+from .revisions import revision_diff, revision_texts, save_with_revision
+from .signals import follow_toggled
+from .tagging import index_comments, index_posts
+from .tasks import make_thumbnails
+from .utills import get_cursor_page, get_page, get_paginator
 
 
 @cache_page(timeout=CACHE_SAVE_TIME, key_prefix='index_page')
+@replica_reads
 def index(request):
     template = 'posts/index.html'
 
-    post_list = Post.objects.select_related('author', 'group').all()
+    post_list = Post.objects.for_feed()
     page_obj = get_paginator(request, post_list)['page_obj']
 
     context = {
@@ -25,12 +44,56 @@ def index(request):
     return render(request, template, context)
 
 
+@cache_page(timeout=CACHE_SAVE_TIME, key_prefix='tag_page')
+@replica_reads
+def tag_posts(request, name):
+    template = 'posts/tag.html'
+
+    tag = name.lower()
+    posts, next_cursor = get_cursor_page(
+        request, Post.objects.for_feed().filter(tagged__tag__name=tag)
+    )
+
+    context = {
+        'tag': tag,
+        'page_obj': posts,
+        'next_cursor': next_cursor,
+    }
+
+    return render(request, template, context)
+
+
+@cache_page(timeout=CACHE_SAVE_TIME, key_prefix='popular_page')
+@replica_reads
+def popular(request):
+    template = 'posts/popular.html'
+
+    post_list = Post.objects.for_feed().filter(
+        score__isnull=False
+    ).order_by('-score__score')
+    page_obj = get_paginator(request, post_list)['page_obj']
+
+    context = {
+        'post_list': post_list,
+        'page_obj': page_obj,
+        'popular': True
+    }
+
+    return render(request, template, context)
+
+
+@replica_reads
 def group_posts(request, slug):
     template = 'posts/group_list.html'
 
-    group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.select_related('author', 'group').all()
-    page_obj = get_paginator(request, post_list)['page_obj']
+    # Шаблон группы выводит полный текст и полное имя автора.
+    post_list = Post.objects.for_feed(
+        'text', 'author__first_name', 'author__last_name'
+    ).filter(group__slug=slug)
+    group, page_obj = gather(
+        partial(groups_by_slug.get_or_404, slug),
+        partial(get_page, request, post_list),
+    )
 
     context = {
         'post_list': post_list,
@@ -42,15 +105,35 @@ def group_posts(request, slug):
     return render(request, template, context)
 
 
+@cache_page(timeout=CACHE_SAVE_TIME, key_prefix='groups_page')
+@replica_reads
+def groups(request):
+    template = 'posts/groups.html'
+
+    group_list = Group.objects.select_related('stats').order_by(
+        F('stats__post_count').desc(nulls_last=True), 'title'
+    )
+    page_obj = get_page(request, group_list)
+
+    context = {
+        'page_obj': page_obj,
+        'groups': True
+    }
+
+    return render(request, template, context)
+
+
+@replica_reads
 def profile(request, username):
     template = 'posts/profile.html'
 
-    user = get_object_or_404(User, username=username)
-    following = Follow.objects.filter(author=user).exists()
-    post_list = user.posts.select_related('author', 'group').all()
-    page_obj = get_paginator(request, post_list)['page_obj']
-
-    count_posts = post_list.count()
+    user = users_by_username.get_or_404(username)
+    post_list = Post.objects.for_feed().filter(author_id=user.pk)
+    # Число постов берётся из счётчика, поэтому COUNT(*) пагинатору
+    # не нужен.
+    count_posts = author_post_count(user.pk)
+    page_obj = get_page(request, post_list, count_posts)
+    following = user.pk in get_following_ids(request)
     is_user = request.user.username == username
 
     context = {
@@ -60,42 +143,63 @@ def profile(request, username):
         'following': following,
         'count_posts': count_posts,
         'is_user': is_user,
-        'is_profile': True
+        'is_profile': True,
+        'suggestions': get_suggestions(request) if is_user else []
     }
 
     return render(request, template, context)
 
 
+@replica_reads
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
 
-    post = get_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST or None)
-    comments = Comment.objects.select_related(
-        'author',
-        'post'
-    ).filter(
-        post__pk=post_id
+    queryset = Comment.objects.select_related('author').filter(
+        post_id=post_id
+    ).order_by('pk')
+
+    # Читаем на один комментарий больше порога: так видно, нужен ли
+    # поток, без отдельного COUNT и без загрузки всего списка.
+    post, comments = gather(
+        Post.objects.select_related('author', 'group').filter(
+            pk=post_id
+        ).first,
+        partial(list, queryset[:STREAM_COMMENTS_THRESHOLD + 1]),
     )
-
-    count_posts = Post.objects.select_related(
-        'author',
-        'group'
-    ).filter(
-        author__username=post.author.username
-    ).count()
+    # Старые посты перенесены архивацией: в горячей таблице их нет.
+    archived = post is None
+    if archived:
+        post, comments = get_archived_post(post_id)
+    count_posts = author_post_count(post.author_id)
 
     context = {
         'post': post,
         'comments': comments,
         'form': form,
-        'count_posts': count_posts
+        'count_posts': count_posts,
+        'archived': archived,
     }
 
+    if len(comments) > STREAM_COMMENTS_THRESHOLD:
+        context['stream_comments'] = True
+        if not archived:
+            comments = chain(comments, queryset.filter(
+                pk__gt=comments[-1].pk
+            ).iterator())
+        return stream_template(
+            request,
+            template,
+            context,
+            '<!--comments-->',
+            render_batches('includes/comments.html', 'comments', comments)
+        )
+
     return render(request, template, context)
 
 
 @login_required
+@pin_to_primary
 def post_create(request):
     template = 'posts/create_post.html'
 
@@ -110,11 +214,15 @@ def post_create(request):
     post = form.save(commit=False)
     post.author = request.user
     post.save()
+    index_posts([post])
+    if post.image:
+        make_thumbnails.delay(post.pk)
 
     return redirect('posts:profile', request.user)
 
 
 @login_required
+@pin_to_primary
 def post_edit(request, post_id):
     template = 'posts/create_post.html'
 
@@ -136,12 +244,57 @@ def post_edit(request, post_id):
             {'form': form, 'is_edit': True, 'post': post}
         )
 
-    form.save()
+    if 'text' in form.changed_data:
+        post = save_with_revision(post, form.save)
+        index_posts([post])
+    else:
+        post = form.save()
+    if 'image' in form.changed_data and post.image:
+        make_thumbnails.delay(post.pk)
 
     return redirect('posts:post_detail', post_id)
 
 
+@replica_reads
+def post_history(request, post_id):
+    template = 'posts/post_history.html'
+
+    post = get_object_or_404(Post.objects.select_related('author'), pk=post_id)
+    revisions = list(post.revisions.defer('data'))
+
+    context = {'post': post, 'revisions': revisions}
+    if revisions:
+        numbers = [revision.number for revision in revisions]
+        number = request.GET.get('revision', '')
+        number = int(number) if number.isdigit() else numbers[-1]
+        if number not in numbers:
+            number = numbers[-1]
+        texts = revision_texts(post.pk, max(number - 1, numbers[0]), number)
+        context.update({
+            'number': number,
+            'text': texts[number],
+            'diff': revision_diff(texts.get(number - 1, ''), texts[number]),
+        })
+
+    return render(request, template, context)
+
+
+@login_required
+@require_POST
+@pin_to_primary
+def post_delete(request, post_id):
+    post = get_object_or_404(Post, pk=post_id)
+
+    if post.author_id != request.user.pk:
+        return redirect('posts:post_detail', post_id)
+
+    post.soft_delete()
+
+    return redirect('posts:profile', request.user)
+
+
 @login_required
+@pin_to_primary
 def add_comment(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST or None)
@@ -151,59 +304,81 @@ def add_comment(request, post_id):
         comment.author = request.user
         comment.post = post
         comment.save()
+        index_comments([comment])
+        notify_comment.delay(comment.pk)
 
     return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
+@replica_reads
 def follow_index(request):
-    posts = Post.objects.filter(author__following__user=request.user)
+    posts = Post.objects.for_feed().filter(
+        author__following__user=request.user
+    )
     page_obj = get_paginator(request, posts)['page_obj']
 
     context = {
         'follow': True,
         'posts': posts,
-        'page_obj': page_obj
+        'page_obj': page_obj,
+        'suggestions': get_suggestions(request)
     }
 
     return render(request, 'posts/follow.html', context)
 
 
-@login_required
-def profile_follow(request, username):
-
-    user = get_object_or_404(User, username=request.user)
-    author = get_object_or_404(User, username=username)
+def follow_response(request, username, following):
+    """Для AJAX - кнопка в новом состоянии, иначе - возврат в профиль."""
+    if request.is_ajax():
+        context = {'author': {'username': username}, 'following': following}
+        return render(request, 'includes/follow_button.html', context)
+    return redirect('posts:profile', username=username)
 
-    follower = user.follower.filter(author=author).exists()
 
-    if request.user.username == username or follower:
-        return redirect('posts:profile', username=username)
+@login_required
+@require_POST
+@pin_to_primary
+def profile_follow(request, username):
+    if request.user.username == username:
+        return follow_response(request, username, False)
 
-    Follow.objects.create(
-        user=user,
-        author=author
+    author_id = users_by_username.get_or_404(username).pk
+    follow = Follow.objects.filter(
+        user_id=request.user.pk, author_id=author_id
     )
+    # Повторный клик не должен снова помечать рейтинг и уведомлять.
+    # Гонка двух кликов безопасна: вставку отсекает уникальный индекс.
+    if not follow.exists():
+        Follow.objects.bulk_create(
+            [Follow(user_id=request.user.pk, author_id=author_id)],
+            ignore_conflicts=True
+        )
+        follow_toggled.send(
+            sender=Follow,
+            user_id=request.user.pk,
+            author_id=author_id,
+            following=True
+        )
 
-    return redirect('posts:profile', username=username)
+    return follow_response(request, username, True)
 
 
 @login_required
+@require_POST
+@pin_to_primary
 def profile_unfollow(request, username):
+    author_id = users_by_username.get_or_404(username).pk
+    deleted, _ = Follow.objects.filter(
+        user_id=request.user.pk,
+        author_id=author_id
+    ).delete()
+    if deleted:
+        follow_toggled.send(
+            sender=Follow,
+            user_id=request.user.pk,
+            author_id=author_id,
+            following=False
+        )
 
-    user = get_object_or_404(User, username=request.user)
-    author = get_object_or_404(User, username=username)
-
-    follower = user.follower.filter(author=author).exists()
-
-    if request.user.username == username or not follower:
-        return redirect('posts:profile', username=username)
-
-    follow = get_object_or_404(
-        Follow,
-        user=user,
-        author=author
-    )
-    follow.delete()
-
-    return redirect('posts:profile', username=username)
+    return follow_response(request, username, False)
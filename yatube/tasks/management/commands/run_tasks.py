@@ -0,0 +1,56 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ... import worker
+from ...queue import claim, schedule_periodic
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в пуле потоков или процессов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument(
+            '--pool', choices=('thread', 'process'), default='thread'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Пауза между опросами пустой очереди, секунд.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти.'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if options['pool'] == 'process':
+            connections.close_all()
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=worker.init_process,
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+
+        done = failed = 0
+        with pool:
+            while True:
+                schedule_periodic()
+                task_ids = claim(workers * 2)
+                connections.close_all()
+                if not task_ids:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+                    continue
+                for ok in pool.map(worker.run_task, task_ids):
+                    done += ok
+                    failed += not ok
+
+        self.stdout.write(f'Done: {done}, failed: {failed}')
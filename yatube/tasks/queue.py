@@ -0,0 +1,177 @@
+import json
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+_executor = None
+
+
+class TaskFunction:
+    def __init__(self, func, name, max_retries, retry_delay, every):
+        self.func = func
+        self.name = name
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.every = every
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self.name, args, kwargs)
+
+
+def task(func=None, *, name=None, max_retries=3, retry_delay=10,
+         every=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    Вызов task_function.delay(...) ставит её в очередь TASKS_BACKEND.
+    Аргументы должны сериализоваться в JSON. Задачу с every воркер
+    run_tasks сам запускает раз в every секунд.
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registry[task_name] = TaskFunction(
+            func, task_name, max_retries, retry_delay, every
+        )
+        return registry[task_name]
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def enqueue(name, args=(), kwargs=None, run_at=None):
+    kwargs = kwargs or {}
+    backend = settings.TASKS_BACKEND
+    if backend == 'eager':
+        registry[name](*args, **kwargs)
+        return None
+    if backend == 'thread':
+        _get_executor().submit(_run_in_thread, name, args, kwargs)
+        return None
+    task_obj = Task(
+        name=name,
+        args=json.dumps(list(args), cls=DjangoJSONEncoder),
+        kwargs=json.dumps(kwargs, cls=DjangoJSONEncoder),
+        run_at=run_at or timezone.now(),
+    )
+    if settings.TASKS_DATABASE:
+        # Отдельная БД коммитит строку сразу, и воркер мог бы взять
+        # задачу раньше, чем закоммитятся её данные в default.
+        transaction.on_commit(task_obj.save)
+        return None
+    task_obj.save()
+    return task_obj
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.TASKS_THREAD_WORKERS,
+            thread_name_prefix='tasks',
+        )
+    return _executor
+
+
+def _run_in_thread(name, args, kwargs):
+    close_old_connections()
+    try:
+        registry[name](*args, **kwargs)
+    except Exception:
+        logger.exception('Task %s failed', name)
+    finally:
+        close_old_connections()
+
+
+def schedule_periodic():
+    """Ставит в очередь периодические задачи без ожидающего запуска."""
+    pending = set(
+        Task.objects.filter(
+            status__in=(Task.QUEUED, Task.RUNNING)
+        ).order_by().values_list('name', flat=True).distinct()
+    )
+    now = timezone.now()
+    Task.objects.bulk_create(
+        Task(
+            name=function.name,
+            run_at=now + timedelta(seconds=function.every)
+        )
+        for function in registry.values()
+        if function.every and function.name not in pending
+    )
+
+
+def claim(limit):
+    """Забирает до limit готовых задач, помечая их выполняющимися.
+
+    Задача в статусе RUNNING с истёкшим run_at считается брошенной
+    упавшим воркером и забирается снова.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.TASKS_LEASE_TIME)
+    candidates = Task.objects.filter(
+        Q(status=Task.QUEUED) | Q(status=Task.RUNNING),
+        run_at__lte=now,
+    ).values_list('pk', 'run_at')[:limit]
+
+    claimed = []
+    for pk, run_at in candidates:
+        updated = Task.objects.filter(pk=pk, run_at=run_at).update(
+            status=Task.RUNNING,
+            run_at=lease_until,
+            attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def execute(task_id):
+    """Выполняет задачу; успешные удаляются, упавшие повторяются."""
+    task = Task.objects.get(pk=task_id)
+    function = registry.get(task.name)
+    try:
+        if function is None:
+            raise LookupError(f'Unknown task {task.name}')
+        function(*json.loads(task.args), **json.loads(task.kwargs))
+    except Exception:
+        retry = function is not None and task.attempts <= function.max_retries
+        if retry:
+            delay = function.retry_delay * 2 ** (task.attempts - 1)
+            run_at = timezone.now() + timedelta(seconds=delay)
+        else:
+            run_at = task.run_at
+        Task.objects.filter(pk=task_id).update(
+            status=Task.QUEUED if retry else Task.FAILED,
+            run_at=run_at,
+            last_error=traceback.format_exc(),
+        )
+        logger.exception('Task %s #%s failed', task.name, task_id)
+        return False
+    else:
+        Task.objects.filter(pk=task_id).delete()
+        return True
+
+
+def run_task(task_id):
+    """Точка входа пула воркера: подключения живут как в запросе."""
+    close_old_connections()
+    try:
+        return execute(task_id)
+    finally:
+        close_old_connections()
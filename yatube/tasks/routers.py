@@ -0,0 +1,25 @@
+from django.conf import settings
+
+
+class TasksRouter:
+    """Держит очередь задач в отдельной БД, если задан TASKS_DATABASE."""
+
+    def _db(self, model):
+        if settings.TASKS_DATABASE and model._meta.app_label == 'tasks':
+            return settings.TASKS_DATABASE
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._db(model)
+
+    def db_for_write(self, model, **hints):
+        return self._db(model)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not settings.TASKS_DATABASE:
+            return None
+        if app_label == 'tasks':
+            return db == settings.TASKS_DATABASE
+        if db == settings.TASKS_DATABASE:
+            return False
+        return None
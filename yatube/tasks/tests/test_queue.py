@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tasks.models import Task
+from tasks.queue import (claim, execute, registry, schedule_periodic,
+                         task)
+
+User = get_user_model()
+
+calls = []
+
+
+@task(name='tests.record', max_retries=1, retry_delay=0)
+def record(value):
+    if value == 'fail':
+        raise ValueError(value)
+    calls.append(value)
+
+
+class QueueTestCase(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_task_registered_by_decorator(self):
+        self.assertIs(registry['tests.record'], record)
+        self.assertIn('core.tasks.send_email', registry)
+        self.assertIn('posts.tasks.make_thumbnails', registry)
+
+    def test_delay_stores_task_until_worker_runs_it(self):
+        record.delay('one')
+        self.assertEqual(calls, [])
+
+        task_ids = claim(10)
+        self.assertEqual(len(task_ids), 1)
+        self.assertEqual(claim(10), [])
+
+        self.assertTrue(execute(task_ids[0]))
+        self.assertEqual(calls, ['one'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failed_task_is_retried_then_marked_failed(self):
+        record.delay('fail')
+
+        self.assertFalse(execute(claim(10)[0]))
+        task_obj = Task.objects.get()
+        self.assertEqual(task_obj.status, Task.QUEUED)
+        self.assertIn('ValueError', task_obj.last_error)
+
+        self.assertFalse(execute(claim(10)[0]))
+        task_obj.refresh_from_db()
+        self.assertEqual(task_obj.status, Task.FAILED)
+        self.assertEqual(task_obj.attempts, 2)
+        self.assertEqual(claim(10), [])
+
+    def test_abandoned_task_is_claimed_again(self):
+        record.delay('one')
+        claim(10)
+        Task.objects.update(run_at=timezone.now())
+
+        self.assertEqual(len(claim(10)), 1)
+
+    def test_periodic_task_scheduled_once(self):
+        schedule_periodic()
+        schedule_periodic()
+        self.assertEqual(
+            Task.objects.filter(name='posts.tasks.recompute_scores').count(),
+            1
+        )
+
+    def test_separate_database_task_saved_on_commit(self):
+        with patch('tasks.queue.transaction.on_commit') as on_commit:
+            with override_settings(TASKS_DATABASE='tasks'):
+                self.assertIsNone(record.delay('one'))
+        self.assertFalse(Task.objects.exists())
+
+        on_commit.call_args[0][0]()
+        self.assertEqual(Task.objects.get().name, 'tests.record')
+
+    @override_settings(TASKS_BACKEND='eager')
+    def test_eager_backend_runs_immediately(self):
+        record.delay('one')
+        self.assertEqual(calls, ['one'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_password_reset_email_is_queued(self):
+        User.objects.create_user(
+            username='dev', email='dev@example.com', password='pass'
+        )
+        self.client.post(
+            '/auth/password_reset/', {'email': 'dev@example.com'}
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+        execute(claim(10)[0])
+        self.assertEqual(mail.outbox[0].to, ['dev@example.com'])
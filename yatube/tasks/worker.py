@@ -0,0 +1,16 @@
+"""Точки входа пула процессов воркера.
+
+Модуль импортируется дочерним процессом до django.setup(), поэтому
+модели и очередь импортируются внутри функций.
+"""
+import django
+
+
+def init_process():
+    django.setup()
+
+
+def run_task(task_id):
+    from .queue import run_task
+
+    return run_task(task_id)
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY, get_user_model)
+from django.core.cache import cache
+from django.db.models import DEFERRED
+from django.utils.crypto import constant_time_compare
+
+USER_CACHE_KEY = 'auth_user:{}'
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+def _load_user(request, user_id):
+    """Пользователь из БД; кеш обновляется или сбрасывается."""
+    user = auth.get_user(request)
+    if not user.is_authenticated:
+        cache.delete(user_cache_key(user_id))
+        return user
+
+    # Хеш пароля в кеш не попадает: в кеше лежит только хеш сессии,
+    # а пароль при обращении загрузится из БД как отложенное поле.
+    fields = user._meta.concrete_fields
+    cached = type(user).from_db(
+        user._state.db,
+        [field.attname for field in fields],
+        [
+            DEFERRED if field.attname == 'password'
+            else getattr(user, field.attname)
+            for field in fields
+        ]
+    )
+    cache.set(
+        user_cache_key(user.pk),
+        (cached, user.get_session_auth_hash()),
+        settings.USER_CACHE_TIME
+    )
+    return user
+
+
+def get_user(request):
+    """Как django.contrib.auth.get_user, но пользователь берётся из кеша.
+
+    Хеш сессии сверяется с закешированным, поэтому смена пароля
+    разлогинивает остальные сессии, как только кеш сброшен сигналом.
+    Кеш должен быть общим для процессов, см. USER_CACHE_TIME.
+    """
+    if not settings.USER_CACHE_TIME:
+        return auth.get_user(request)
+    try:
+        user_id = get_user_model()._meta.pk.to_python(
+            request.session[SESSION_KEY]
+        )
+    except KeyError:
+        return auth.get_user(request)
+
+    backend_path = request.session.get(BACKEND_SESSION_KEY)
+    cached = cache.get(user_cache_key(user_id))
+    if cached is None or backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return _load_user(request, user_id)
+
+    user, user_hash = cached
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(session_hash, user_hash):
+        return _load_user(request, user_id)
+    user.backend = backend_path
+    return user
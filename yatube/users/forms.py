@@ -1,5 +1,12 @@
+from core.tasks import send_email
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import (AuthenticationForm, PasswordResetForm,
+                                       UserCreationForm)
+from django.core.exceptions import ValidationError
+from django.template import loader
+
+from .throttle import (is_throttled, login_throttle_keys, register_failure,
+                       reset_failures)
 
 User = get_user_model()
 
@@ -8,3 +15,47 @@ class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Письмо собирается в запросе, а отправляется фоновой задачей."""
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = loader.render_to_string(subject_template_name, context)
+        subject = ''.join(subject.splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        html_body = None
+        if html_email_template_name is not None:
+            html_body = loader.render_to_string(
+                html_email_template_name, context
+            )
+        send_email.delay(subject, body, from_email, [to_email], html_body)
+
+
+class ThrottledAuthenticationForm(AuthenticationForm):
+    """Вход с ограничением неудачных попыток по IP и по логину.
+
+    При превышении предела пароль не проверяется вовсе, поэтому перебор
+    не нагружает процессор хешированием.
+    """
+
+    error_messages = {
+        **AuthenticationForm.error_messages,
+        'throttled': 'Слишком много попыток входа. Попробуйте позже.',
+    }
+
+    def clean(self):
+        keys = login_throttle_keys(self.request, self.data.get('username'))
+        if is_throttled(keys):
+            raise ValidationError(
+                self.error_messages['throttled'], code='throttled'
+            )
+        try:
+            cleaned_data = super().clean()
+        except ValidationError:
+            register_failure(keys)
+            raise
+        reset_failures(keys)
+        return cleaned_data
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 с числом итераций из PBKDF2_ITERATIONS.
+
+    Имя алгоритма прежнее, поэтому старые хеши проверяются, а при входе
+    пересчитываются с новым числом итераций.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
@@ -0,0 +1,7 @@
+from django.core.management import call_command
+from tasks.queue import task
+
+
+@task(every=24 * 60 * 60)
+def clear_expired_sessions():
+    call_command('clearsessions')
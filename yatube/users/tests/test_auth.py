@@ -0,0 +1,111 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from tasks.queue import registry
+from users.auth import user_cache_key
+
+User = get_user_model()
+
+
+# Как с общим кешем: пользователь и сессия читаются из кеша.
+@override_settings(
+    USER_CACHE_TIME=300,
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db'
+)
+class AuthFastPathTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dev', password='pass')
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username='dev', password='pass')
+
+    def test_session_and_user_served_from_cache(self):
+        self.client.get('/about/tech/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/about/tech/')
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_drops_cached_user(self):
+        self.client.get('/about/tech/')
+        self.user.set_password('new')
+        self.user.save()
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+        response = self.client.get('/about/tech/')
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_password_hash_not_cached(self):
+        self.client.get('/about/tech/')
+        cached, _ = cache.get(user_cache_key(self.user.pk))
+
+        self.assertNotIn('password', cached.__dict__)
+        self.assertTrue(cached.check_password('pass'))
+
+    def test_stale_entry_refreshed_on_hash_mismatch(self):
+        self.client.get('/about/tech/')
+        stale, _ = cache.get(user_cache_key(self.user.pk))
+        # Другой процесс сменил пароль, а его сброс кеша сюда не дошёл.
+        User.objects.filter(pk=self.user.pk).update(password='changed')
+        cache.set(user_cache_key(self.user.pk), (stale, 'old-hash'))
+
+        response = self.client.get('/about/tech/')
+
+        self.assertFalse(response.context['user'].is_authenticated)
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_expired_sessions_cleared_by_task(self):
+        Session.objects.update(expire_date='2000-01-01 00:00Z')
+        registry['users.tasks.clear_expired_sessions']()
+        self.assertFalse(Session.objects.exists())
+
+
+class LoginThrottleTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dev', password='pass')
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, password):
+        return self.client.post(
+            '/auth/login/', {'username': 'dev', 'password': password}
+        )
+
+    @override_settings(LOGIN_ATTEMPTS_PER_USERNAME=2)
+    def test_username_locked_after_failures(self):
+        self.login('wrong')
+        self.login('wrong')
+
+        with patch('django.contrib.auth.forms.authenticate') as auth:
+            response = self.login('pass')
+
+        auth.assert_not_called()
+        self.assertContains(response, 'Слишком много попыток входа')
+
+    def test_success_resets_failures(self):
+        self.login('wrong')
+        self.assertRedirects(
+            self.login('pass'), '/', fetch_redirect_response=False
+        )
+        self.assertIsNone(cache.get('login_failures:user:dev'))
+
+
+class PasswordHasherTestCase(TestCase):
+
+    def test_password_rehashed_with_new_iterations(self):
+        user = User.objects.create_user(username='dev', password='pass')
+        self.assertIn('$150000$', user.password)
+
+        with override_settings(PBKDF2_ITERATIONS=1000):
+            self.assertTrue(self.client.login(username='dev', password='pass'))
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
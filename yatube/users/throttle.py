@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+def login_throttle_keys(request, username):
+    """Ключи счётчиков неудачных входов и их пределы."""
+    return {
+        f'login_failures:ip:{request.META.get("REMOTE_ADDR")}':
+            settings.LOGIN_ATTEMPTS_PER_IP,
+        f'login_failures:user:{(username or "").lower()}':
+            settings.LOGIN_ATTEMPTS_PER_USERNAME,
+    }
+
+
+def is_throttled(keys):
+    failures = cache.get_many(keys)
+    return any(failures.get(key, 0) >= limit for key, limit in keys.items())
+
+
+def register_failure(keys):
+    for key in keys:
+        if not cache.add(key, 1, settings.LOGIN_THROTTLE_WINDOW):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, 1, settings.LOGIN_THROTTLE_WINDOW)
+
+
+def reset_failures(keys):
+    cache.delete_many(
+        [key for key in keys if key.startswith('login_failures:user:')]
+    )
@@ -8,6 +8,7 @@ from django.contrib.auth.views import (LoginView, LogoutView,
 from django.urls import path, reverse_lazy
 
 from . import views
+from .forms import QueuedPasswordResetForm, ThrottledAuthenticationForm
 
 app_name = 'users'
 
@@ -28,6 +29,7 @@ urlpatterns = [
         'login/',
         LoginView.as_view(
             template_name='users/login.html',
+            form_class=ThrottledAuthenticationForm,
             extra_context={'btn_text': 'login'}
         ),
         name='login'
@@ -52,6 +54,7 @@ urlpatterns = [
         'password_reset/',
         PasswordResetView.as_view(
             template_name='users/password_reset_form.html',
+            form_class=QueuedPasswordResetForm,
             success_url=reverse_lazy('users:password_reset_done')
         ),
         name='password_reset'
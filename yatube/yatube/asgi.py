@@ -1,7 +1,21 @@
 import os
 
-from django.core.asgi import get_asgi_application
+from django.conf import settings
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
-application = get_asgi_application()
+try:
+    from django.core.asgi import get_asgi_application
+except ImportError:
+    from django.core.wsgi import get_wsgi_application
+
+    from core.asgi import WsgiToAsgi
+
+    application = WsgiToAsgi(get_wsgi_application())
+else:
+    application = get_asgi_application()
+
+if settings.TEMPLATE_CACHE:
+    from core.warmup import warm_templates
+
+    warm_templates()
@@ -1,3 +1,4 @@
+import importlib.util
 import os
 from pathlib import Path
 
@@ -5,7 +6,7 @@ BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 
 SECRET_KEY = 'hbbtoyy7u5ibu)g)!x@+x#z^^y$ia((d_fqjwg+-7xx#fs7p1s'
 
-DEBUG = True
+DEBUG = os.getenv('DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -19,6 +20,8 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'tasks.apps.TasksConfig',
+    'notifications.apps.NotificationsConfig',
 
     'sorl.thumbnail',
 
@@ -32,10 +35,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.TemplateProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -43,30 +48,123 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# Скомпилированные шаблоны хранятся в памяти процесса; правки шаблонов
+# видны только после перезапуска, поэтому при DEBUG кеш выключен.
+TEMPLATE_CACHE = os.getenv('TEMPLATE_CACHE', '0' if DEBUG else '1') == '1'
+if TEMPLATE_CACHE:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+# Server-Timing и лог времени рендера каждого шаблона запроса.
+TEMPLATE_PROFILING = os.getenv('TEMPLATE_PROFILING', '0') == '1'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.navigation.navigation',
+                'posts.context_processors.following.following',
+                'notifications.context_processors.unread.'
+                'unread_notifications',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
+ASGI_APPLICATION = 'yatube.asgi.application'
 
-DATABASES = {
-    'default': {
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+# Пустая строка - прямое подключение, 'pgbouncer' - через внешний пул
+# в режиме transaction pooling.
+DB_POOL = os.getenv('DB_POOL', '')
+CONN_MAX_AGE = int(os.getenv('CONN_MAX_AGE', 60))
+
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', 'yatube'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': CONN_MAX_AGE,
+            'DISABLE_SERVER_SIDE_CURSORS': DB_POOL == 'pgbouncer',
+        }
+    }
+
+# Реплика для чтения лент и профилей. Если не задана, все запросы
+# идут в default.
+DB_REPLICA_NAME = os.getenv('DB_REPLICA_NAME')
+if DB_REPLICA_NAME:
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        NAME=DB_REPLICA_NAME,
+        HOST=os.getenv('DB_REPLICA_HOST', DATABASES['default'].get('HOST')),
+        TEST={'MIRROR': 'default'},
+    )
+REPLICA_DATABASE = 'replica' if DB_REPLICA_NAME else None
+# Сколько секунд после изменений пользователь читает только из default.
+REPLICA_STICKY_TIME = 10
+
+# Очередь фоновых задач можно держать в отдельном файле SQLite.
+TASKS_DB_NAME = os.getenv('TASKS_DB_NAME')
+if TASKS_DB_NAME:
+    DATABASES['tasks'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': TASKS_DB_NAME,
+    }
+TASKS_DATABASE = 'tasks' if TASKS_DB_NAME else None
+
+# Архив старых постов можно держать в отдельном файле SQLite.
+ARCHIVE_DB_NAME = os.getenv('ARCHIVE_DB_NAME')
+if ARCHIVE_DB_NAME:
+    DATABASES['archive'] = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'NAME': ARCHIVE_DB_NAME,
     }
+ARCHIVE_DATABASE = 'archive' if ARCHIVE_DB_NAME else None
+# Посты старше стольких дней переносятся в архив; 0 - не переносить.
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 0))
+# Через сколько дней мягко удалённый пост удаляется окончательно.
+SOFT_DELETE_RETENTION_DAYS = 30
+
+DATABASE_ROUTERS = [
+    'tasks.routers.TasksRouter',
+    'posts.routers.ArchiveRouter',
+    'core.routers.ReplicaRouter',
+]
+
+# Потоки для параллельных независимых запросов внутри представления
+# (core.concurrency.gather); 0 - выполнять последовательно.
+VIEW_FANOUT_WORKERS = int(os.getenv('VIEW_FANOUT_WORKERS', 4))
+
+# Применяются к каждому новому подключению SQLite (core.db.tune_sqlite).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -84,6 +182,33 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Алгоритм новых хешей паролей: 'argon2' (argon2-cffi), 'bcrypt' (bcrypt)
+# или 'pbkdf2'. Недоступный алгоритм заменяется на pbkdf2. Хеши других
+# алгоритмов проверяются и пересчитываются при входе.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2')
+PBKDF2_ITERATIONS = int(os.getenv('PBKDF2_ITERATIONS', 150000))
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': (None, 'users.hashers.PBKDF2PasswordHasher'),
+    'argon2': ('argon2', 'django.contrib.auth.hashers.Argon2PasswordHasher'),
+    'bcrypt': (
+        'bcrypt', 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher'
+    ),
+}
+PASSWORD_HASHERS = [
+    hasher for name, (module, hasher) in sorted(
+        PASSWORD_HASHER_CHOICES.items(),
+        key=lambda choice: choice[0] != PASSWORD_HASHER
+    )
+    if module is None or importlib.util.find_spec(module)
+]
+PASSWORD_HASHERS.append('django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher')
+
+# Неудачные попытки входа за LOGIN_THROTTLE_WINDOW секунд, после которых
+# вход с IP или для логина временно запрещён.
+LOGIN_ATTEMPTS_PER_IP = 20
+LOGIN_ATTEMPTS_PER_USERNAME = 5
+LOGIN_THROTTLE_WINDOW = 300
+
 LANGUAGE_CODE = 'ru'
 
 TIME_ZONE = 'UTC'
@@ -96,12 +221,26 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Отдавать собранную статику самим Django (core.static.serve), если
+# перед приложением нет nginx с gzip_static.
+STATIC_SERVE = os.getenv('STATIC_SERVE', '') == '1'
+
+# Сколько секунд пользователь сессии хранится в кеше; 0 - не кешировать.
+# Включать только с общим для всех процессов кешем (memcached, redis):
+# с locmem смена пароля или блокировка сбрасывает кеш лишь в процессе,
+# который их сохранил, а остальные до USER_CACHE_TIME пускают старые
+# сессии.
+USER_CACHE_TIME = int(os.getenv('USER_CACHE_TIME', 0))
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# Адрес сайта для ссылок в письмах, отправляемых вне запроса.
+SITE_URL = os.getenv('SITE_URL', 'http://127.0.0.1:8000')
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
@@ -114,3 +253,34 @@ CACHES = {
     }
 }
 CACHE_SAVE_TIME = 20
+# Общий ли кеш для всех процессов: locmem у каждого процесса свой.
+SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# cached_db читает сессию из кеша и пишет в БД; signed_cookies хранит
+# её в подписанной cookie без обращения к БД. cached_db выбирается
+# только с общим кешем: с locmem выход или flush() в одном процессе не
+# сбрасывают сессию в кеше остальных.
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.'
+    + ('cached_db' if SHARED_CACHE else 'db')
+)
+
+# Кнопки подписки на карточках постов в лентах.
+CARD_FOLLOW_BUTTONS = os.getenv('CARD_FOLLOW_BUTTONS', '0') == '1'
+
+# Не считать COUNT(*) для ленты: номер последней страницы не выводится.
+PAGINATOR_SKIP_COUNT = os.getenv('PAGINATOR_SKIP_COUNT', '0') == '1'
+
+# С какого числа комментариев post_detail отдаётся потоком.
+STREAM_COMMENTS_THRESHOLD = 100
+
+# 'database' - надёжная очередь в БД и воркер run_tasks,
+# 'thread' - пул потоков веб-процесса, 'eager' - сразу в запросе.
+TASKS_BACKEND = os.getenv('TASKS_BACKEND', 'database')
+TASKS_THREAD_WORKERS = 2
+# Через сколько секунд задача упавшего воркера снова попадёт в очередь.
+TASKS_LEASE_TIME = 300
@@ -1,6 +1,7 @@
+from core.static import serve as serve_static
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 from yatube import settings
 
@@ -8,6 +9,10 @@ urlpatterns = [
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path(
+        'notifications/',
+        include('notifications.urls', namespace='notifications')
+    ),
     path('admin/', admin.site.urls),
     path('', include('posts.urls', namespace='posts')),
 ]
@@ -21,3 +26,9 @@ if settings.DEBUG:
         settings.MEDIA_URL,
         document_root=settings.MEDIA_ROOT
     )
+
+if settings.STATIC_SERVE:
+    urlpatterns.insert(0, re_path(
+        r'^{}(?P<path>.*)$'.format(settings.STATIC_URL.lstrip('/')),
+        serve_static
+    ))